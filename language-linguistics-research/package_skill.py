@@ -6,6 +6,7 @@
 """
 
 import os
+import re
 import zipfile
 import shutil
 
@@ -22,7 +23,7 @@ includes = [
 ]
 
 # 排除的文件和目录
-excludes = [
+EXCLUDE_PATHS = [
     "__pycache__",
     "*.pyc",
     "*.pyo",
@@ -30,12 +31,21 @@ excludes = [
     "package_skill.py"
 ]
 
+def compile_exclude_patterns(patterns):
+    """
+    将排除规则编译为一个正则表达式
+    
+    不含通配符的规则匹配完整的路径组成部分（目录名或文件名），
+    含"*"的规则按glob语义匹配单个路径组成部分（如"*.pyc"匹配任意目录下的.pyc文件）。
+    """
+    alternatives = [re.escape(pattern).replace(r"\*", "[^/]*") for pattern in patterns]
+    return re.compile(r"(?:^|/)(?:" + "|".join(alternatives) + r")(?:/|$)")
+
+EXCLUDE_RE = compile_exclude_patterns(EXCLUDE_PATHS)
+
 def should_exclude(path):
-    """检查路径是否应该被排除"""
-    for exclude in excludes:
-        if exclude in path:
-            return True
-    return False
+    """检查路径是否应该被排除（按相对于技能目录的路径匹配）"""
+    return EXCLUDE_RE.search(os.path.relpath(path, skill_dir).replace(os.sep, "/")) is not None
 
 def add_to_zip(zipf, base_dir, path):
     """将文件或目录添加到zip文件"""
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# 关键词多模式匹配模块
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def build_automaton(category_terms):
+    """
+    为分类关键词构建Aho-Corasick自动机
+    
+    Args:
+        category_terms (dict): 类别到关键词列表的映射
+        
+    Returns:
+        ahocorasick.Automaton: 自动机，未安装pyahocorasick时返回None
+    """
+    if ahocorasick is None:
+        return None
+    
+    term_categories = {}
+    for category, terms in category_terms.items():
+        for term in terms:
+            term_categories.setdefault(term, []).append(category)
+    
+    automaton = ahocorasick.Automaton()
+    for term, categories in term_categories.items():
+        automaton.add_word(term, tuple(categories))
+    automaton.make_automaton()
+    return automaton
+
+
+def match_categories(automaton, category_terms, text):
+    """
+    单次扫描文本，找出命中关键词的所有类别
+    
+    Args:
+        automaton (ahocorasick.Automaton): 由build_automaton构建的自动机
+        category_terms (dict): 类别到关键词列表的映射（无自动机时逐个子串匹配）
+        text (str): 要扫描的文本
+        
+    Returns:
+        set: 命中的类别集合
+    """
+    if automaton is None:
+        return {category for category, terms in category_terms.items() if any(term in text for term in terms)}
+    
+    hits = set()
+    for _, categories in automaton.iter(text):
+        hits.update(categories)
+    return hits
@@ -1,12 +1,93 @@
 #!/usr/bin/env python3
 # 语义学分析模块
 
-from collections import defaultdict
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
 from nltk.corpus import wordnet
 from nltk.stem import WordNetLemmatizer
 import spacy
 import networkx as nx
 
+from .keyword_matching import build_automaton, match_categories
+
+# 框架触发词（简化版，实际应用中可以使用FrameNet或PropBank）
+_FRAME_TRIGGERS = {
+    "motion": frozenset(["go", "come", "move", "run", "walk", "travel"]),
+    "change": frozenset(["change", "become", "turn", "transform", "convert"]),
+    "causation": frozenset(["cause", "make", "create", "produce", "generate"]),
+    "perception": frozenset(["see", "hear", "feel", "smell", "taste"]),
+    "emotion": frozenset(["feel", "love", "hate", "like", "dislike", "fear"]),
+    "communication": frozenset(["say", "tell", "speak", "talk", "communicate"]),
+    "action": frozenset(["do", "act", "perform", "execute", "carry out"])
+}
+
+# 概念隐喻的表达模式
+_METAPHOR_PATTERNS = {
+    "TIME_IS_MONEY": ("spend time", "waste time", "save time", "invest time", "time is precious"),
+    "LOVE_IS_A_JOURNEY": ("relationship is a journey", "we're at a crossroads", "we're on the right track", "we've come a long way"),
+    "ARGUMENT_IS_WAR": ("win an argument", "lose an argument", "attack position", "defend position", "shoot down ideas"),
+    "IDEAS_ARE_FOOD": ("digest ideas", "swallow ideas", "chew on ideas", "spit out ideas"),
+    "MIND_IS_A_COMPUTER": ("process information", "store memories", "retrieve information", "compute answers")
+}
+
+
+def _build_trigger_index(category_terms):
+    """
+    构建关键词到类别的倒排索引
+    
+    Args:
+        category_terms (dict): 类别到关键词集合的映射
+        
+    Returns:
+        dict: 关键词到类别元组的映射（同一关键词可触发多个类别）
+    """
+    index = {}
+    for category, terms in category_terms.items():
+        for term in terms:
+            index.setdefault(term, []).append(category)
+    return {term: tuple(categories) for term, categories in index.items()}
+
+
+# 各语言对应的spaCy模型
+_SPACY_MODELS = {
+    "english": "en_core_web_sm",
+    "chinese": "zh_core_web_sm",
+    "french": "fr_core_news_sm",
+    "german": "de_core_news_sm",
+    "spanish": "es_core_news_sm"
+}
+
+
+@lru_cache(maxsize=8)
+def _load_nlp(language, disabled=("ner", "lemmatizer")):
+    """
+    加载并缓存spaCy模型，同一语言在进程内只加载一次
+    
+    Args:
+        language (str): 语言名称
+        disabled (tuple): 不需要的管道组件
+        
+    Returns:
+        spacy.language.Language: spaCy模型，不支持的语言或加载失败时返回None
+    """
+    if language not in _SPACY_MODELS:
+        return None
+    
+    try:
+        return spacy.load(_SPACY_MODELS[language], disable=list(disabled))
+    except Exception as e:
+        # 失败结果同样被缓存，每种语言只警告一次
+        print(f"警告: 无法加载spaCy模型: {e}")
+        return None
+
+
+_WORD_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+_TRIGGER_TO_FRAMES = _build_trigger_index(_FRAME_TRIGGERS)
+# 多词触发词（如"carry out"）的首词，遇到时再检查二元组
+_MULTIWORD_TRIGGER_HEADS = frozenset(trigger.split()[0] for trigger in _TRIGGER_TO_FRAMES if " " in trigger)
+_METAPHOR_AUTOMATON = build_automaton(_METAPHOR_PATTERNS)
+
 class SemanticsAnalysis:
     """语义学分析类"""
     
@@ -22,20 +103,8 @@ class SemanticsAnalysis:
         self.language = language.lower()
         self.lemmatizer = WordNetLemmatizer()
         
-        # 加载对应的spaCy模型
-        self.nlp = None
-        try:
-            model_map = {
-                "english": "en_core_web_sm",
-                "chinese": "zh_core_web_sm",
-                "french": "fr_core_news_sm",
-                "german": "de_core_news_sm",
-                "spanish": "es_core_news_sm"
-            }
-            if self.language in model_map:
-                self.nlp = spacy.load(model_map[self.language])
-        except Exception as e:
-            print(f"警告: 无法加载spaCy模型: {e}")
+        # 加载对应的spaCy模型（同一进程内按语言复用）
+        self.nlp = _load_nlp(self.language)
     
     def analyze_semantic_relations(self):
         """
@@ -60,36 +129,50 @@ class SemanticsAnalysis:
                 doc = self.nlp(self.text)
                 tokens = [token for token in doc if token.is_alpha]
                 
+                words = [token.text for token in tokens]
+                
+                # 每个不同的词只查询一次WordNet，词对比较只做集合查找
+                relation_cache = {}
+                
                 # 分析词对之间的语义关系
-                for i, token1 in enumerate(tokens):
-                    for token2 in tokens[i+1:]:
+                for i, word1 in enumerate(words):
+                    if word1 not in relation_cache:
+                        relation_cache[word1] = (
+                            set(self._find_synonyms(word1)),
+                            set(self._find_antonyms(word1)),
+                            set(self._find_hyponyms(word1)),
+                            set(self._find_hypernyms(word1))
+                        )
+                    synonyms1, antonyms1, hyponyms1, hypernyms1 = relation_cache[word1]
+                    
+                    for word2 in words[i+1:]:
                         # 分析同义关系
-                        synonyms1 = self._find_synonyms(token1.text)
-                        if token2.text in synonyms1:
-                            semantic_relations["synonymy"].append((token1.text, token2.text))
+                        if word2 in synonyms1:
+                            semantic_relations["synonymy"].append((word1, word2))
                         
                         # 分析反义关系
-                        antonyms1 = self._find_antonyms(token1.text)
-                        if token2.text in antonyms1:
-                            semantic_relations["antonymy"].append((token1.text, token2.text))
+                        if word2 in antonyms1:
+                            semantic_relations["antonymy"].append((word1, word2))
                         
                         # 分析上下义关系
-                        hyponyms1 = self._find_hyponyms(token1.text)
-                        if token2.text in hyponyms1:
-                            semantic_relations["hyponymy"].append((token1.text, token2.text))
+                        if word2 in hyponyms1:
+                            semantic_relations["hyponymy"].append((word1, word2))
                         
-                        hypernyms1 = self._find_hypernyms(token1.text)
-                        if token2.text in hypernyms1:
-                            semantic_relations["hyponymy"].append((token2.text, token1.text))
+                        if word2 in hypernyms1:
+                            semantic_relations["hyponymy"].append((word2, word1))
             except Exception as e:
                 print(f"语义关系分析失败: {e}")
         
         return semantic_relations
     
-    def build_semantic_network(self):
+    def build_semantic_network(self, include_semantic_relations=False):
         """
         构建文本的语义网络
         
+        Args:
+            include_semantic_relations (bool): 是否添加WordNet语义关系边，默认为False。
+                开启后会调用analyze_semantic_relations，耗时与词数的平方成正比
+        
         Returns:
             nx.Graph: 语义网络图
         """
@@ -102,28 +185,26 @@ class SemanticsAnalysis:
                 tokens = [token for token in doc if token.is_alpha and len(token.text) > 2]
                 
                 # 添加节点
-                for token in tokens:
-                    G.add_node(token.text, pos=token.pos_)
+                G.add_nodes_from((token.text, {"pos": token.pos_}) for token in tokens)
                 
-                # 添加边（基于共现关系）
+                # 添加边（基于共现关系）：先统计窗口内的词对，再批量写入图
                 window_size = 3
-                for i, token1 in enumerate(tokens):
-                    for j in range(max(0, i-window_size), min(len(tokens), i+window_size+1)):
-                        if i != j:
-                            token2 = tokens[j]
-                            if not G.has_edge(token1.text, token2.text):
-                                G.add_edge(token1.text, token2.text, weight=1)
-                            else:
-                                G[token1.text][token2.text]['weight'] += 1
+                words = [token.text for token in tokens]
+                edge_weights = Counter()
+                for i, word1 in enumerate(words):
+                    for word2 in words[i + 1:i + 1 + window_size]:
+                        edge_weights[(word1, word2) if word1 <= word2 else (word2, word1)] += 1
+                G.add_weighted_edges_from((word1, word2, weight) for (word1, word2), weight in edge_weights.items())
                 
-                # 添加语义关系边
-                semantic_relations = self.analyze_semantic_relations()
-                for relation_type, relations in semantic_relations.items():
-                    for relation in relations:
-                        if len(relation) == 2:
-                            word1, word2 = relation
-                            if G.has_node(word1) and G.has_node(word2):
-                                G.add_edge(word1, word2, relation=relation_type)
+                # 添加语义关系边（可选）
+                if include_semantic_relations:
+                    semantic_relations = self.analyze_semantic_relations()
+                    for relation_type, relations in semantic_relations.items():
+                        for relation in relations:
+                            if len(relation) == 2:
+                                word1, word2 = relation
+                                if G.has_node(word1) and G.has_node(word2):
+                                    G.add_edge(word1, word2, relation=relation_type)
             except Exception as e:
                 print(f"语义网络构建失败: {e}")
         
@@ -141,28 +222,18 @@ class SemanticsAnalysis:
             "frame_elements": []  # 框架元素
         }
         
-        # 简化的框架语义分析
-        # 实际应用中可以使用FrameNet或PropBank
-        frame_triggers = {
-            "motion": ["go", "come", "move", "run", "walk", "travel"],
-            "change": ["change", "become", "turn", "transform", "convert"],
-            "causation": ["cause", "make", "create", "produce", "generate"],
-            "perception": ["see", "hear", "feel", "smell", "taste"],
-            "emotion": ["feel", "love", "hate", "like", "dislike", "fear"],
-            "communication": ["say", "tell", "speak", "talk", "communicate"],
-            "action": ["do", "act", "perform", "execute", "carry out"]
-        }
-        
-        # 识别框架
-        text_lower = self.text.lower()
-        for frame, triggers in frame_triggers.items():
-            for trigger in triggers:
-                if trigger in text_lower:
-                    frame_semantics["frames"].append(frame)
-                    break
-        
-        # 去重
-        frame_semantics["frames"] = list(set(frame_semantics["frames"]))
+        # 简化的框架语义分析：逐词查询倒排索引，所有框架都已命中时提前结束
+        words = _WORD_RE.findall(self.text.lower())
+        hits = set()
+        for i, word in enumerate(words):
+            frames = _TRIGGER_TO_FRAMES.get(word)
+            if frames:
+                hits.update(frames)
+            if word in _MULTIWORD_TRIGGER_HEADS and i + 1 < len(words):
+                hits.update(_TRIGGER_TO_FRAMES.get(f"{word} {words[i + 1]}", ()))
+            if len(hits) == len(_FRAME_TRIGGERS):
+                break
+        frame_semantics["frames"] = list(hits)
         
         return frame_semantics
     
@@ -173,23 +244,9 @@ class SemanticsAnalysis:
         Returns:
             list: 概念隐喻列表
         """
-        conceptual_metaphors = []
-        
-        # 简化的概念隐喻识别
-        metaphor_patterns = {
-            "TIME_IS_MONEY": ["spend time", "waste time", "save time", "invest time", "time is precious"],
-            "LOVE_IS_A_JOURNEY": ["relationship is a journey", "we're at a crossroads", "we're on the right track", "we've come a long way"],
-            "ARGUMENT_IS_WAR": ["win an argument", "lose an argument", "attack position", "defend position", "shoot down ideas"],
-            "IDEAS_ARE_FOOD": ["digest ideas", "swallow ideas", "chew on ideas", "spit out ideas"],
-            "MIND_IS_A_COMPUTER": ["process information", "store memories", "retrieve information", "compute answers"]
-        }
-        
-        text_lower = self.text.lower()
-        for metaphor, patterns in metaphor_patterns.items():
-            for pattern in patterns:
-                if pattern in text_lower:
-                    conceptual_metaphors.append(metaphor)
-                    break
+        # 简化的概念隐喻识别：单次扫描，按模式定义顺序输出
+        hits = match_categories(_METAPHOR_AUTOMATON, _METAPHOR_PATTERNS, self.text.lower())
+        conceptual_metaphors = [metaphor for metaphor in _METAPHOR_PATTERNS if metaphor in hits]
         
         return conceptual_metaphors
     
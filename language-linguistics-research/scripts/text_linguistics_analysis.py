@@ -4,10 +4,145 @@
 import re
 import string
 from collections import Counter
+from functools import cached_property
+import numpy as np
 from nltk.tokenize import word_tokenize, sent_tokenize
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 
+from .keyword_matching import build_automaton, match_categories
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# 拉丁字母语言使用预编译正则分词，其他语言回退到NLTK
+_LATIN_LANGUAGES = frozenset(["english", "french", "german", "spanish", "italian", "portuguese", "dutch"])
+_TOKEN_RE = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?|\d+|[^\w\s]")
+_SENT_RE = re.compile(r"[^.!?\s][^.!?]*(?:[.!?]+|$)")
+
+# 语言识别只检查文本开头的字符
+_LANGUAGE_SAMPLE_SIZE = 4096
+_CJK_RE = re.compile(r"[\u4e00-\u9fff]")
+_ENGLISH_RE = re.compile(r'[a-zA-Z0-9\s.,!?;:"]*')
+
+# 情感词表（简化版）
+_POSITIVE_WORDS = frozenset(["good", "great", "excellent", "wonderful", "perfect", "happy", "joy", "love", "like", "enjoy"])
+_NEGATIVE_WORDS = frozenset(["bad", "terrible", "awful", "horrible", "sad", "hate", "dislike", "pain", "suffering", "angry"])
+
+# 正式度词表（简化版）
+_FORMAL_WORDS = frozenset(["therefore", "however", "nevertheless", "consequently", "furthermore", "moreover", "hence", "thus", "accordingly", "additionally"])
+_INFORMAL_WORDS = frozenset(["yeah", "gotta", "wanna", "gonna", "lemme", "kinda", "sorta", "ain't", "don't"])
+
+# 体裁识别关键词（按优先级排列）
+_GENRE_TERMS = {
+    "academic": ("abstract", "introduction", "methodology", "results", "discussion", "conclusion", "references"),
+    "news": ("breaking news", "report", "journalist", "source says", "according to"),
+    "fiction": ("chapter", "story", "character", "plot", "scene"),
+    "essay": ("essay", "reflection", "personal experience", "thoughts")
+}
+
+# 语域识别关键词（按优先级排列）
+_REGISTER_TERMS = {
+    "formal": ("therefore", "however", "nevertheless", "consequently", "furthermore"),
+    "informal": ("yeah", "gotta", "wanna", "gonna", "lemme"),
+    "colloquial": ("you know", "like", "sort of", "kind of", "I mean")
+}
+
+
+def _syllable_counts_kernel(chars, offsets, lengths):
+    """
+    在打包的字符数组上逐词运行音节计数状态机（供Numba编译）
+    
+    Args:
+        chars (numpy.ndarray): 所有小写单词拼接而成的uint8数组
+        offsets (numpy.ndarray): 每个单词在chars中的起始位置
+        lengths (numpy.ndarray): 每个单词的字节长度
+        
+    Returns:
+        numpy.ndarray: 每个单词的音节数
+    """
+    counts = np.empty(lengths.size, dtype=np.int64)
+    for k in range(lengths.size):
+        start = offsets[k]
+        end = start + lengths[k]
+        count = 0
+        prev_char_was_vowel = False
+        for i in range(start, end):
+            c = chars[i]
+            # a e i o u y
+            is_vowel = c == 97 or c == 101 or c == 105 or c == 111 or c == 117 or c == 121
+            if is_vowel and not prev_char_was_vowel:
+                count += 1
+            prev_char_was_vowel = is_vowel
+        
+        # 调整：以e结尾的单词通常减少一个音节
+        if end > start and chars[end - 1] == 101 and count > 1:
+            count -= 1
+        
+        counts[k] = max(1, count)
+    return counts
+
+
+if njit is not None:
+    # 首次调用时才编译，导入模块不付出编译开销；cache=True把编译结果缓存到磁盘供之后的进程复用
+    _syllable_counts_jit = njit(cache=True)(_syllable_counts_kernel)
+else:
+    _syllable_counts_jit = None
+
+
+def _count_syllables_array(words):
+    """
+    批量计算单词的音节数（简化版，与TextLinguisticsAnalysis._count_syllables规则一致）
+    
+    所有单词被拼接为一个uint8数组，安装了Numba时使用JIT编译的状态机，
+    否则在NumPy中一次性完成元音组计数。
+    
+    Args:
+        words (list): 单词列表
+        
+    Returns:
+        numpy.ndarray: 每个单词的音节数
+    """
+    if not words:
+        return np.zeros(0, dtype=np.int64)
+    
+    encoded = [word.lower().encode("utf-8") for word in words]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    chars = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    
+    if _syllable_counts_jit is not None:
+        return _syllable_counts_jit(chars, offsets, lengths)
+    
+    non_empty = lengths > 0
+    
+    # 元音组起点：当前字符为元音且前一字符不是同一单词内的元音
+    is_vowel = np.isin(chars, np.frombuffer(b"aeiouy", dtype=np.uint8))
+    prev_is_vowel = np.concatenate(([False], is_vowel[:-1]))
+    prev_is_vowel[offsets[non_empty]] = False
+    group_starts = (is_vowel & ~prev_is_vowel).astype(np.int64)
+    
+    counts = np.zeros(len(words), dtype=np.int64)
+    if chars.size:
+        counts[non_empty] = np.add.reduceat(group_starts, offsets[non_empty])
+    
+    # 调整：以e结尾的单词通常减少一个音节
+    ends_with_e = np.zeros(len(words), dtype=bool)
+    ends_with_e[non_empty] = chars[(offsets + lengths - 1)[non_empty]] == ord("e")
+    counts[ends_with_e & (counts > 1)] -= 1
+    
+    return np.maximum(counts, 1)
+
+
+# 体裁与语域关键词合并为一个带标签的自动机，一次扫描同时回答两类问题
+_TEXT_TYPE_TERMS = {
+    **{("genre", genre): terms for genre, terms in _GENRE_TERMS.items()},
+    **{("register", register): terms for register, terms in _REGISTER_TERMS.items()}
+}
+_TEXT_TYPE_AUTOMATON = build_automaton(_TEXT_TYPE_TERMS)
+
 class TextLinguisticsAnalysis:
     """文本语言学分析类"""
     
@@ -21,11 +156,51 @@ class TextLinguisticsAnalysis:
         """
         self.text = text
         self.language = language.lower()
+        self._is_english = self.language == "english"
         self.lemmatizer = WordNetLemmatizer()
         
         # 简化版本：移除spaCy依赖
         self.nlp = None
     
+    @cached_property
+    def _words(self):
+        """分词结果（只计算一次，供各分析方法共享）"""
+        if self.language in _LATIN_LANGUAGES:
+            return _TOKEN_RE.findall(self.text)
+        return word_tokenize(self.text)
+    
+    @cached_property
+    def _sentences(self):
+        """分句结果（只计算一次，供各分析方法共享）"""
+        if self.language in _LATIN_LANGUAGES:
+            return _SENT_RE.findall(self.text)
+        return sent_tokenize(self.text)
+    
+    @cached_property
+    def _words_lower(self):
+        """小写形式的分词结果"""
+        return [word.lower() for word in self._words]
+    
+    @cached_property
+    def _token_counts(self):
+        """小写词频统计"""
+        return Counter(self._words_lower)
+    
+    @cached_property
+    def _text_lower(self):
+        """小写形式的全文"""
+        return self.text.lower()
+    
+    @cached_property
+    def _text_type_hits(self):
+        """全文中命中的体裁/语域类别，形如("genre", "academic")"""
+        return match_categories(_TEXT_TYPE_AUTOMATON, _TEXT_TYPE_TERMS, self._text_lower)
+    
+    @cached_property
+    def _stopwords(self):
+        """当前语言的停用词集合"""
+        return frozenset(stopwords.words(self.language))
+    
     def analyze_text_features(self):
         """
         分析文本的基本特征
@@ -34,12 +209,12 @@ class TextLinguisticsAnalysis:
             dict: 包含文本特征的字典
         """
         # 分词和分句
-        words = word_tokenize(self.text)
-        sentences = sent_tokenize(self.text)
+        words = self._words
+        sentences = self._sentences
         
         # 去除标点和停用词
-        stop_words = set(stopwords.words(self.language))
-        filtered_words = [word.lower() for word in words if word.isalnum() and word.lower() not in stop_words]
+        stop_words = self._stopwords
+        filtered_words = [lower for word, lower in zip(words, self._words_lower) if word.isalnum() and lower not in stop_words]
         
         # 计算基本统计信息
         word_count = len(words)
@@ -66,14 +241,10 @@ class TextLinguisticsAnalysis:
             dict: 包含风格特征的字典
         """
         # 简化版本：移除TextBlob依赖，使用基本的情感分析
-        # 正面词和负面词列表（简化版）
-        positive_words = set(["good", "great", "excellent", "wonderful", "perfect", "happy", "joy", "love", "like", "enjoy"])
-        negative_words = set(["bad", "terrible", "awful", "horrible", "sad", "hate", "dislike", "pain", "suffering", "angry"])
-        
-        # 分析情感
-        words = word_tokenize(self.text)
-        positive_count = sum(1 for word in words if word.lower() in positive_words)
-        negative_count = sum(1 for word in words if word.lower() in negative_words)
+        # 分析情感：直接查询共享的词频统计
+        token_counts = self._token_counts
+        positive_count = sum(token_counts[word] for word in _POSITIVE_WORDS)
+        negative_count = sum(token_counts[word] for word in _NEGATIVE_WORDS)
         
         total = positive_count + negative_count
         if total > 0:
@@ -127,16 +298,18 @@ class TextLinguisticsAnalysis:
         Returns:
             dict: 包含可读性指标的字典
         """
-        # 仅支持英语的可读性指标
-        if self.language != "english":
+        # 仅支持英语的可读性指标，在任何分词或计数之前返回
+        if not self._is_english:
             return {"error": "仅支持英语文本的可读性分析"}
         
         # Flesch-Kincaid可读性指数
-        words = word_tokenize(self.text)
-        sentences = sent_tokenize(self.text)
+        words = self._words
+        sentences = self._sentences
         
-        # 计算音节数（简化版）
-        syllable_count = sum(self._count_syllables(word) for word in words if word.isalnum())
+        # 计算音节数（简化版），所有单词一次性批量计算
+        syllables = _count_syllables_array(words)
+        is_alnum = np.fromiter((word.isalnum() for word in words), dtype=bool, count=len(words))
+        syllable_count = int(syllables[is_alnum].sum())
         
         # Flesch-Kincaid Grade Level
         if len(words) > 0 and len(sentences) > 0:
@@ -145,9 +318,9 @@ class TextLinguisticsAnalysis:
             fk_grade = 0
         
         # Gunning Fog指数
-        complex_words = [word for word in words if self._count_syllables(word) >= 3]
+        complex_word_count = int((syllables >= 3).sum())
         if len(words) > 0 and len(sentences) > 0:
-            fog_index = 0.4 * ((len(words) / len(sentences)) + 100 * (len(complex_words) / len(words)))
+            fog_index = 0.4 * ((len(words) / len(sentences)) + 100 * (complex_word_count / len(words)))
         else:
             fog_index = 0
         
@@ -192,13 +365,10 @@ class TextLinguisticsAnalysis:
         Returns:
             float: 正式度分数（0-1）
         """
-        # 简化的正式度计算
-        formal_words = set(["therefore", "however", "nevertheless", "consequently", "furthermore", "moreover", "hence", "thus", "accordingly", "additionally"])
-        informal_words = set(["yeah", "yeah", "gotta", "wanna", "gonna", "lemme", "kinda", "sorta", "ain't", "don't"])
-        
-        words = word_tokenize(self.text)
-        formal_count = sum(1 for word in words if word.lower() in formal_words)
-        informal_count = sum(1 for word in words if word.lower() in informal_words)
+        # 简化的正式度计算：直接查询共享的词频统计
+        token_counts = self._token_counts
+        formal_count = sum(token_counts[word] for word in _FORMAL_WORDS)
+        informal_count = sum(token_counts[word] for word in _INFORMAL_WORDS)
         
         total = formal_count + informal_count
         if total == 0:
@@ -214,8 +384,8 @@ class TextLinguisticsAnalysis:
         Returns:
             float: 复杂度分数（0-1）
         """
-        words = word_tokenize(self.text)
-        sentences = sent_tokenize(self.text)
+        words = self._words
+        sentences = self._sentences
         
         if not words:
             return 0
@@ -238,20 +408,19 @@ class TextLinguisticsAnalysis:
         Returns:
             str: 语言名称
         """
-        # 简化版本：基于字符特征的语言识别
-        text = self.text
+        # 简化版本：基于字符特征的语言识别，只检查文本开头的样本
+        sample = self.text[:_LANGUAGE_SAMPLE_SIZE]
         
-        # 中文特征：包含中文字符
-        if re.search(r'[\u4e00-\u9fff]', text):
+        # 中文特征：包含中文字符；全ASCII的样本不可能含有中文字符，跳过扫描
+        if not sample.isascii() and _CJK_RE.search(sample):
             return "chinese"
         
         # 英文特征：主要包含英文字母和常见英文标点
-        elif re.search(r'^[a-zA-Z0-9\s.,!?;:"]*$', text.replace('\n', ' ')):
+        if _ENGLISH_RE.fullmatch(sample):
             return "english"
         
         # 其他语言暂不支持
-        else:
-            return "unknown"
+        return "unknown"
     
     def _identify_genre(self):
         """
@@ -260,24 +429,11 @@ class TextLinguisticsAnalysis:
         Returns:
             str: 体裁名称
         """
-        # 简化的体裁识别
-        text_lower = self.text.lower()
-        
-        # 学术论文特征
-        if any(term in text_lower for term in ["abstract", "introduction", "methodology", "results", "discussion", "conclusion", "references"]):
-            return "academic"
-        
-        # 新闻特征
-        if any(term in text_lower for term in ["breaking news", "report", "journalist", "source says", "according to"]):
-            return "news"
-        
-        # 小说特征
-        if any(term in text_lower for term in ["chapter", "story", "character", "plot", "scene"]):
-            return "fiction"
-        
-        # 散文特征
-        if any(term in text_lower for term in ["essay", "reflection", "personal experience", "thoughts"]):
-            return "essay"
+        # 简化的体裁识别：按优先级返回第一个命中的体裁
+        hits = self._text_type_hits
+        for genre in _GENRE_TERMS:
+            if ("genre", genre) in hits:
+                return genre
         
         return "unknown"
     
@@ -288,19 +444,10 @@ class TextLinguisticsAnalysis:
         Returns:
             str: 语域名称
         """
-        # 简化的语域识别
-        text_lower = self.text.lower()
-        
-        # 正式语域特征
-        if any(term in text_lower for term in ["therefore", "however", "nevertheless", "consequently", "furthermore"]):
-            return "formal"
-        
-        # 非正式语域特征
-        if any(term in text_lower for term in ["yeah", "gotta", "wanna", "gonna", "lemme"]):
-            return "informal"
-        
-        # 口语特征
-        if any(term in text_lower for term in ["you know", "like", "sort of", "kind of", "I mean"]):
-            return "colloquial"
+        # 简化的语域识别：按优先级返回第一个命中的语域
+        hits = self._text_type_hits
+        for register in _REGISTER_TERMS:
+            if ("register", register) in hits:
+                return register
         
         return "neutral"
@@ -1,12 +1,132 @@
 #!/usr/bin/env python3
 # 词汇学分析模块
 
+import os
 import re
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+import numpy as np
 from nltk.corpus import wordnet
 from nltk.stem import WordNetLemmatizer
 from nltk.tokenize import word_tokenize
 
+# 简化的语义类别及其代表词
+_SEMANTIC_CATEGORIES = {
+    "person": ("man", "woman", "child", "person", "people", "human"),
+    "animal": ("dog", "cat", "bird", "fish", "animal"),
+    "plant": ("tree", "flower", "plant", "grass", "leaf"),
+    "object": ("table", "chair", "book", "pen", "computer"),
+    "action": ("run", "walk", "eat", "drink", "write"),
+    "quality": ("good", "bad", "happy", "sad", "big", "small"),
+    "quantity": ("one", "two", "three", "many", "few", "some"),
+    "time": ("time", "day", "night", "year", "month", "hour"),
+    "space": ("space", "place", "location", "position", "distance"),
+    "abstract": ("love", "hate", "truth", "beauty", "freedom")
+}
+
+# 常见前缀和后缀，按长度从长到短（同长度按字母顺序）排列
+_PREFIXES = tuple(sorted(["un", "re", "in", "im", "il", "ir", "dis", "en", "em", "non", "pre", "post", "anti", "auto", "bi", "co", "de", "ex", "inter", "intra", "micro", "mid", "mis", "over", "poly", "sub", "super", "tele", "trans", "under", "uni"], key=lambda affix: (-len(affix), affix)))
+_SUFFIXES = tuple(sorted(["s", "es", "ed", "ing", "ly", "er", "est", "ment", "ness", "ity", "ty", "al", "ial", "ic", "ical", "ful", "less", "ous", "eous", "ious", "ive", "ative", "itive", "able", "ible", "y", "en", "ify", "fy", "ize", "ise"], key=lambda affix: (-len(affix), affix)))
+
+
+def _build_affix_trie(affixes):
+    """
+    构建词缀trie，终止节点的None键记录词缀在列表中的次序
+    
+    Args:
+        affixes (tuple): 按优先级排列的词缀
+        
+    Returns:
+        dict: 嵌套字典形式的trie
+    """
+    trie = {}
+    for rank, affix in enumerate(affixes):
+        node = trie
+        for char in affix:
+            node = node.setdefault(char, {})
+        node[None] = rank
+    return trie
+
+
+def _match_affixes(trie, chars):
+    """
+    沿trie走一遍，找出chars开头匹配的所有词缀
+    
+    Args:
+        trie (dict): 由_build_affix_trie构建的trie
+        chars (str): 要匹配的字符串（后缀匹配时传入反转的单词）
+        
+    Returns:
+        list: (次序, 长度)元组列表
+    """
+    node = trie
+    matches = []
+    for length, char in enumerate(chars, 1):
+        node = node.get(char)
+        if node is None:
+            break
+        if None in node:
+            matches.append((node[None], length))
+    return matches
+
+
+_PREFIX_TRIE = _build_affix_trie(_PREFIXES)
+_SUFFIX_TRIE = _build_affix_trie(tuple(suffix[::-1] for suffix in _SUFFIXES))
+
+
+# 屈折变化后缀（各后缀末字母不同，一个词最多命中一种）
+_INFLECTION_RE = re.compile(
+    r"(?:(?P<plural>(?<!s)s)|(?P<past_tense>ed)|(?P<present_participle>ing)"
+    r"|(?P<comparative>er)|(?P<superlative>est))\Z"
+)
+
+# 每类语义关系最多返回的词数
+_MAX_RELATED_WORDS = 10
+
+
+def _synset_word(synset):
+    """
+    从synset名称中取出词形（如"dog.n.01" -> "dog"）
+    
+    Args:
+        synset: WordNet synset
+        
+    Returns:
+        str: 词形
+    """
+    return synset.name().split('.')[0].replace('_', ' ')
+
+
+def _copy_analysis(analysis):
+    """
+    复制单个词的分析结果（含其中的列表和字典），使调用方修改返回值不影响缓存
+    
+    Args:
+        analysis (dict): 缓存中的单词分析结果
+        
+    Returns:
+        dict: 分析结果的副本
+    """
+    return {
+        key: _copy_analysis(value) if isinstance(value, dict) else list(value) if isinstance(value, list) else value
+        for key, value in analysis.items()
+    }
+
+
+def _analyze_chunk(args):
+    """
+    在子进程中分析一段词汇（供ProcessPoolExecutor调用）
+    
+    Args:
+        args (tuple): (词汇列表, 语言, 分析方法名)
+        
+    Returns:
+        dict: 该段词汇的分析结果
+    """
+    words, language, method = args
+    return getattr(VocabularyAnalysis(words, language), method)()
+
 class VocabularyAnalysis:
     """词汇学分析类"""
     
@@ -21,55 +141,117 @@ class VocabularyAnalysis:
         self.vocabulary = vocabulary
         self.language = language.lower()
         self.lemmatizer = WordNetLemmatizer()
+        self._lemmatize = self.lemmatizer.lemmatize
         
         # 简化版本：移除spaCy依赖
         self.nlp = None
+        
+        # WordNet查询缓存：每个词只查询一次synsets和词形还原
+        self._synset_cache = {}
+        self._lemma_cache = {}
+        
+        # 逐词分析结果缓存：重复出现的词只分析一次；对外只返回缓存结果的副本
+        self._morph_cache = {}
+        self._sem_cache = {}
+        self._relation_cache = {}
+        try:
+            # 提前加载WordNet语料，避免在逐词分析时触发
+            wordnet.ensure_loaded()
+        except LookupError:
+            pass
     
-    def analyze_morphology(self):
+    def analyze_morphology(self, n_workers=1):
         """
         分析词汇的形态结构
         
+        Args:
+            n_workers (int): 并行进程数，默认为1（不并行）；-1或None表示使用全部CPU核心
+        
         Returns:
             dict: 包含词汇形态分析结果的字典
         """
+        if n_workers != 1:
+            return self._analyze_in_parallel("analyze_morphology", n_workers)
+        
         morphology_analysis = {}
         
+        # 循环内使用局部变量，减少属性查找
+        cache = self._morph_cache
+        extract_root = self._extract_root
+        extract_affixes = self._extract_affixes
+        identify_part_of_speech = self._identify_part_of_speech
+        identify_inflections = self._identify_inflections
+        
         for word in self.vocabulary:
             # 分析词形
-            analysis = {
-                "root": self._extract_root(word),
-                "affixes": self._extract_affixes(word),
-                "part_of_speech": self._identify_part_of_speech(word),
-                "inflections": self._identify_inflections(word)
-            }
-            morphology_analysis[word] = analysis
+            if word not in cache:
+                cache[word] = {
+                    "root": extract_root(word),
+                    "affixes": extract_affixes(word),
+                    "part_of_speech": identify_part_of_speech(word),
+                    "inflections": identify_inflections(word)
+                }
+            morphology_analysis[word] = _copy_analysis(cache[word])
         
         return morphology_analysis
     
-    def analyze_semantics(self):
+    def analyze_semantics(self, n_workers=1):
         """
         分析词汇的语义
         
+        Args:
+            n_workers (int): 并行进程数，默认为1（不并行）；-1或None表示使用全部CPU核心
+        
         Returns:
             dict: 包含词汇语义分析结果的字典
         """
+        if n_workers != 1:
+            return self._analyze_in_parallel("analyze_semantics", n_workers)
+        
         semantics_analysis = {}
         
+        # 循环内使用局部变量，减少属性查找
+        cache = self._sem_cache
+        identify_semantic_category = self._identify_semantic_category
+        gather_relations = self._gather_relations
+        
         for word in self.vocabulary:
-            # 分析语义
-            analysis = {
-                "semantic_category": self._identify_semantic_category(word),
-                "synonyms": self._find_synonyms(word),
-                "antonyms": self._find_antonyms(word),
-                "hyponyms": self._find_hyponyms(word),
-                "hypernyms": self._find_hypernyms(word),
-                "meronyms": self._find_meronyms(word),
-                "holonyms": self._find_holonyms(word)
-            }
-            semantics_analysis[word] = analysis
+            # 分析语义：一次遍历synsets得到全部语义关系
+            if word not in cache:
+                cache[word] = {
+                    "semantic_category": identify_semantic_category(word),
+                    **gather_relations(word)
+                }
+            semantics_analysis[word] = _copy_analysis(cache[word])
         
         return semantics_analysis
     
+    def _analyze_in_parallel(self, method, n_workers):
+        """
+        将词汇按顺序切分，在多个进程中分别分析后合并
+        
+        Args:
+            method (str): 分析方法名
+            n_workers (int): 并行进程数；-1或None表示使用全部CPU核心
+            
+        Returns:
+            dict: 合并后的分析结果，键顺序与词汇列表一致
+        """
+        if n_workers is None or n_workers < 1:
+            n_workers = os.cpu_count() or 1
+        # 只把不重复且尚未缓存的词分发给子进程
+        cache = self._morph_cache if method == "analyze_morphology" else self._sem_cache
+        words = [word for word in dict.fromkeys(self.vocabulary) if word not in cache]
+        n_workers = max(1, min(n_workers, len(words)))
+        chunk_size = -(-len(words) // n_workers) if words else 1
+        chunks = [(words[i:i + chunk_size], self.language, method) for i in range(0, len(words), chunk_size)]
+        
+        if chunks:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                for chunk_result in executor.map(_analyze_chunk, chunks):
+                    cache.update(chunk_result)
+        return {word: _copy_analysis(cache[word]) for word in self.vocabulary}
+    
     def analyze_vocabulary_features(self):
         """
         分析词汇集合的特征
@@ -78,35 +260,59 @@ class VocabularyAnalysis:
             dict: 包含词汇集合特征的字典
         """
         # 计算词汇长度分布
-        word_lengths = [len(word) for word in self.vocabulary]
-        length_counter = Counter(word_lengths)
+        word_lengths = np.fromiter(map(len, self.vocabulary), dtype=np.int32, count=len(self.vocabulary))
+        lengths, length_counts = np.unique(word_lengths, return_counts=True)
+        
+        # 不重复的词只分析一次；已有形态分析结果时直接复用
+        word_features = {}
+        for word in dict.fromkeys(self.vocabulary):
+            morphology = self._morph_cache.get(word)
+            if morphology is not None:
+                word_features[word] = (morphology["part_of_speech"], morphology["affixes"])
+            else:
+                word_features[word] = (self._identify_part_of_speech(word), self._extract_affixes(word))
+        features = [word_features[word] for word in self.vocabulary]
         
         # 计算词类分布
-        pos_distribution = Counter()
-        for word in self.vocabulary:
-            pos = self._identify_part_of_speech(word)
-            pos_distribution[pos] += 1
+        pos_distribution = Counter(pos for pos, _ in features)
         
         # 计算词缀分布
-        prefix_counter = Counter()
-        suffix_counter = Counter()
-        for word in self.vocabulary:
-            affixes = self._extract_affixes(word)
-            for prefix in affixes.get("prefixes", []):
-                prefix_counter[prefix] += 1
-            for suffix in affixes.get("suffixes", []):
-                suffix_counter[suffix] += 1
+        prefix_counter = Counter(prefix for _, affixes in features for prefix in affixes.get("prefixes", []))
+        suffix_counter = Counter(suffix for _, affixes in features for suffix in affixes.get("suffixes", []))
         
         return {
             "total_words": len(self.vocabulary),
-            "unique_words": len(set(self.vocabulary)),
-            "avg_word_length": sum(word_lengths) / len(word_lengths) if word_lengths else 0,
-            "length_distribution": dict(length_counter),
+            "unique_words": len(word_features),
+            "avg_word_length": float(word_lengths.mean()) if word_lengths.size else 0,
+            "length_distribution": dict(zip(lengths.tolist(), length_counts.tolist())),
             "pos_distribution": dict(pos_distribution),
             "prefix_distribution": dict(prefix_counter.most_common(10)),
             "suffix_distribution": dict(suffix_counter.most_common(10))
         }
     
+    def _synsets(self, word):
+        """
+        获取单词的WordNet synsets（带缓存）
+        
+        Args:
+            word (str): 单词
+            
+        Returns:
+            list: synset列表
+        """
+        synsets = self._synset_cache.get(word)
+        if synsets is None:
+            synsets = self._synset_cache[word] = wordnet.synsets(word)
+        return synsets
+    
+    @cached_property
+    def _category_synsets(self):
+        """各语义类别代表词的synset名称集合（每个实例只构建一次）"""
+        return {
+            category: frozenset(synset.name() for keyword in keywords for synset in self._synsets(keyword))
+            for category, keywords in _SEMANTIC_CATEGORIES.items()
+        }
+    
     def _extract_root(self, word):
         """
         提取单词的词根
@@ -117,9 +323,11 @@ class VocabularyAnalysis:
         Returns:
             str: 词根
         """
-        # 使用WordNetLemmatizer提取词根
+        # 使用WordNetLemmatizer提取词根（带缓存）
         # 注意：这是一个简化的方法，实际的词根提取可能更复杂
-        lemma = self.lemmatizer.lemmatize(word)
+        lemma = self._lemma_cache.get(word)
+        if lemma is None:
+            lemma = self._lemma_cache[word] = self._lemmatize(word)
         return lemma
     
     def _extract_affixes(self, word):
@@ -132,24 +340,28 @@ class VocabularyAnalysis:
         Returns:
             dict: 包含前缀和后缀的字典
         """
-        # 常见前缀和后缀
-        prefixes = set(["un", "re", "in", "im", "il", "ir", "dis", "en", "em", "non", "pre", "post", "anti", "auto", "bi", "co", "de", "ex", "inter", "intra", "micro", "mid", "mis", "over", "poly", "sub", "super", "tele", "trans", "under", "uni"])
-        suffixes = set(["s", "es", "ed", "ing", "ly", "er", "est", "ment", "ness", "ity", "ty", "al", "ial", "ic", "ical", "ful", "less", "ous", "eous", "ious", "ive", "ative", "itive", "able", "ible", "y", "en", "ify", "fy", "ize", "ise"])
-        
         found_prefixes = []
         found_suffixes = []
         
-        # 提取前缀
-        for prefix in sorted(prefixes, key=len, reverse=True):
-            if word.startswith(prefix):
-                found_prefixes.append(prefix)
-                word = word[len(prefix):]
-        
-        # 提取后缀
-        for suffix in sorted(suffixes, key=len, reverse=True):
-            if word.endswith(suffix):
-                found_suffixes.append(suffix)
-                word = word[:-len(suffix)]
+        # 提取前缀：按优先级依次剥离，每次只接受排在上一个已剥离前缀之后的前缀
+        last_rank = -1
+        while True:
+            candidates = [match for match in _match_affixes(_PREFIX_TRIE, word) if match[0] > last_rank]
+            if not candidates:
+                break
+            last_rank, length = min(candidates)
+            found_prefixes.append(word[:length])
+            word = word[length:]
+        
+        # 提取后缀：在反转的单词上做同样的匹配
+        last_rank = -1
+        while True:
+            candidates = [match for match in _match_affixes(_SUFFIX_TRIE, word[::-1]) if match[0] > last_rank]
+            if not candidates:
+                break
+            last_rank, length = min(candidates)
+            found_suffixes.append(word[-length:])
+            word = word[:-length]
         
         return {
             "prefixes": found_prefixes,
@@ -168,7 +380,7 @@ class VocabularyAnalysis:
         """
         # 使用WordNet识别词性
         try:
-            synsets = wordnet.synsets(word)
+            synsets = self._synsets(word)
             if synsets:
                 pos = synsets[0].pos()
                 pos_map = {
@@ -193,29 +405,9 @@ class VocabularyAnalysis:
         Returns:
             list: 屈折变化类型
         """
-        inflections = []
-        
-        # 检查复数形式
-        if word.endswith("s") and not word.endswith("ss"):
-            inflections.append("plural")
-        
-        # 检查过去式
-        if word.endswith("ed"):
-            inflections.append("past_tense")
-        
-        # 检查现在分词
-        if word.endswith("ing"):
-            inflections.append("present_participle")
-        
-        # 检查比较级
-        if word.endswith("er"):
-            inflections.append("comparative")
-        
-        # 检查最高级
-        if word.endswith("est"):
-            inflections.append("superlative")
-        
-        return inflections
+        # 复数、过去式、现在分词、比较级、最高级
+        match = _INFLECTION_RE.search(word)
+        return [match.lastgroup] if match else []
     
     def _identify_semantic_category(self, word):
         """
@@ -227,60 +419,85 @@ class VocabularyAnalysis:
         Returns:
             str: 语义类别
         """
-        # 简化的语义类别识别
-        categories = {
-            "person": ["man", "woman", "child", "person", "people", "human"],
-            "animal": ["dog", "cat", "bird", "fish", "animal"],
-            "plant": ["tree", "flower", "plant", "grass", "leaf"],
-            "object": ["table", "chair", "book", "pen", "computer"],
-            "action": ["run", "walk", "eat", "drink", "write"],
-            "quality": ["good", "bad", "happy", "sad", "big", "small"],
-            "quantity": ["one", "two", "three", "many", "few", "some"],
-            "time": ["time", "day", "night", "year", "month", "hour"],
-            "space": ["space", "place", "location", "position", "distance"],
-            "abstract": ["love", "hate", "truth", "beauty", "freedom"]
-        }
-        
-        # 使用WordNet查找语义类别
+        # 简化的语义类别识别：单词的synset或其任一上位词属于某类别代表词的synset时，
+        # 即归入该类别
         try:
-            synsets = wordnet.synsets(word)
+            synsets = self._synsets(word)
             if synsets:
-                # 获取最常见的语义类别
-                for category, keywords in categories.items():
-                    for keyword in keywords:
-                        keyword_synsets = wordnet.synsets(keyword)
-                        for synset in synsets:
-                            for keyword_synset in keyword_synsets:
-                                if synset.wup_similarity(keyword_synset) and synset.wup_similarity(keyword_synset) > 0.8:
-                                    return category
+                related = set()
+                for synset in synsets:
+                    related.add(synset.name())
+                    related.update(hypernym.name() for hypernym in synset.closure(lambda s: s.hypernyms()))
+                
+                for category, category_synsets in self._category_synsets.items():
+                    if not related.isdisjoint(category_synsets):
+                        return category
         except Exception:
             pass
         
         return "unknown"
     
-    def _find_synonyms(self, word):
+    def _gather_relations(self, word):
         """
-        查找单词的同义词
+        一次遍历单词的synsets，同时收集各类语义关系
+        
+        每类关系按WordNet顺序保留前10个不重复的词，所有类别都收满后停止遍历。
         
         Args:
             word (str): 单词
             
         Returns:
-            list: 同义词列表
+            dict: 键为synonyms、antonyms、hyponyms、hypernyms、meronyms、holonyms的词列表字典，
+            每次调用都返回新的列表，修改它们不会影响缓存
         """
-        synonyms = set()
+        relations = self._relation_cache.get(word)
+        if relations is not None:
+            return {name: list(items) for name, items in relations.items()}
+        
+        relations = {name: [] for name in ("synonyms", "antonyms", "hyponyms", "hypernyms", "meronyms", "holonyms")}
+        seen = {name: set() for name in relations}
+        
+        def add(name, item):
+            items = relations[name]
+            if len(items) < _MAX_RELATED_WORDS and item not in seen[name]:
+                seen[name].add(item)
+                items.append(item)
         
         try:
-            synsets = wordnet.synsets(word)
-            for synset in synsets:
+            for synset in self._synsets(word):
                 for lemma in synset.lemmas():
-                    synonym = lemma.name()
-                    if synonym != word:
-                        synonyms.add(synonym.replace('_', ' '))
+                    if lemma.name() != word:
+                        add("synonyms", lemma.name().replace('_', ' '))
+                    for antonym in lemma.antonyms():
+                        add("antonyms", antonym.name().replace('_', ' '))
+                for hyponym in synset.hyponyms():
+                    add("hyponyms", _synset_word(hyponym))
+                for hypernym in synset.hypernyms():
+                    add("hypernyms", _synset_word(hypernym))
+                for meronym in synset.part_meronyms():
+                    add("meronyms", _synset_word(meronym))
+                for holonym in synset.part_holonyms():
+                    add("holonyms", _synset_word(holonym))
+                
+                if all(len(items) >= _MAX_RELATED_WORDS for items in relations.values()):
+                    break
         except Exception:
             pass
         
-        return list(synonyms)[:10]  # 限制返回数量
+        self._relation_cache[word] = relations
+        return {name: list(items) for name, items in relations.items()}
+    
+    def _find_synonyms(self, word):
+        """
+        查找单词的同义词
+        
+        Args:
+            word (str): 单词
+            
+        Returns:
+            list: 同义词列表
+        """
+        return self._gather_relations(word)["synonyms"]
     
     def _find_antonyms(self, word):
         """
@@ -292,19 +509,7 @@ class VocabularyAnalysis:
         Returns:
             list: 反义词列表
         """
-        antonyms = set()
-        
-        try:
-            synsets = wordnet.synsets(word)
-            for synset in synsets:
-                for lemma in synset.lemmas():
-                    if lemma.antonyms():
-                        for antonym in lemma.antonyms():
-                            antonyms.add(antonym.name().replace('_', ' '))
-        except Exception:
-            pass
-        
-        return list(antonyms)[:10]  # 限制返回数量
+        return self._gather_relations(word)["antonyms"]
     
     def _find_hyponyms(self, word):
         """
@@ -316,17 +521,7 @@ class VocabularyAnalysis:
         Returns:
             list: 下位词列表
         """
-        hyponyms = set()
-        
-        try:
-            synsets = wordnet.synsets(word)
-            for synset in synsets:
-                for hyponym in synset.hyponyms():
-                    hyponyms.add(hyponym.name().split('.')[0].replace('_', ' '))
-        except Exception:
-            pass
-        
-        return list(hyponyms)[:10]  # 限制返回数量
+        return self._gather_relations(word)["hyponyms"]
     
     def _find_hypernyms(self, word):
         """
@@ -338,17 +533,7 @@ class VocabularyAnalysis:
         Returns:
             list: 上位词列表
         """
-        hypernyms = set()
-        
-        try:
-            synsets = wordnet.synsets(word)
-            for synset in synsets:
-                for hypernym in synset.hypernyms():
-                    hypernyms.add(hypernym.name().split('.')[0].replace('_', ' '))
-        except Exception:
-            pass
-        
-        return list(hypernyms)[:10]  # 限制返回数量
+        return self._gather_relations(word)["hypernyms"]
     
     def _find_meronyms(self, word):
         """
@@ -360,17 +545,7 @@ class VocabularyAnalysis:
         Returns:
             list: 部分词列表
         """
-        meronyms = set()
-        
-        try:
-            synsets = wordnet.synsets(word)
-            for synset in synsets:
-                for meronym in synset.part_meronyms():
-                    meronyms.add(meronym.name().split('.')[0].replace('_', ' '))
-        except Exception:
-            pass
-        
-        return list(meronyms)[:10]  # 限制返回数量
+        return self._gather_relations(word)["meronyms"]
     
     def _find_holonyms(self, word):
         """
@@ -382,14 +557,4 @@ class VocabularyAnalysis:
         Returns:
             list: 整体词列表
         """
-        holonyms = set()
-        
-        try:
-            synsets = wordnet.synsets(word)
-            for synset in synsets:
-                for holonym in synset.part_holonyms():
-                    holonyms.add(holonym.name().split('.')[0].replace('_', ' '))
-        except Exception:
-            pass
-        
-        return list(holonyms)[:10]  # 限制返回数量
+        return self._gather_relations(word)["holonyms"]
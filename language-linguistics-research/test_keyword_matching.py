@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试关键词多模式匹配模块
+"""
+
+from scripts.keyword_matching import build_automaton, match_categories
+from scripts.text_linguistics_analysis import _TEXT_TYPE_TERMS
+
+# 同一关键词可属于多个类别，关键词之间也可互相包含
+CATEGORY_TERMS = {
+    "formal": ("therefore", "however", "thus"),
+    "informal": ("yeah", "gonna"),
+    "colloquial": ("you know", "like", "kind of", "know"),
+    "shared": ("thus", "like")
+}
+
+TEXTS = [
+    "",
+    " ",
+    "thus",
+    "yeah",
+    "x",
+    "therefore, however, thus",
+    "you know i like it",
+    "unlikely thusly knowing",
+    "kind ofx yeahyeah",
+    "breaking news: according to the report, the story has a new chapter",
+    "abstract introduction methodology results discussion conclusion references"
+]
+
+
+def test_match_categories_matches_substring_scan():
+    """
+    测试自动机匹配与未安装pyahocorasick时的逐个子串匹配结果一致
+    """
+    print("=== 关键词匹配测试 ===")
+
+    for category_terms in (CATEGORY_TERMS, _TEXT_TYPE_TERMS):
+        automaton = build_automaton(category_terms)
+        for text in TEXTS:
+            expected = {category for category, terms in category_terms.items() if any(term in text for term in terms)}
+            assert match_categories(None, category_terms, text) == expected
+            assert match_categories(automaton, category_terms, text) == expected, f"自动机匹配结果不一致: {text!r}"
+
+    print("关键词匹配测试成功!")
+
+
+if __name__ == "__main__":
+    test_match_categories_matches_substring_scan()
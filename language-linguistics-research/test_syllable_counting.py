@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试批量音节计数
+"""
+
+from scripts import text_linguistics_analysis
+from scripts.text_linguistics_analysis import _count_syllables_array
+
+# 空串、单个字母、连续元音、以e结尾、大写、非ASCII字母和标点
+WORDS = ["", "a", "e", "the", "be", "make", "queue", "rhythm", "Beautiful", "AREA",
+         "café", "naïve", "Übermensch", "syllable", "strengths", "you're", "co-operate", "2024", "."]
+
+
+def _count_syllables(word):
+    """
+    逐字符计数的原始实现，作为批量计数的参照
+    """
+    word = word.lower()
+    vowels = "aeiouy"
+    count = 0
+    prev_char_was_vowel = False
+
+    for char in word:
+        if char in vowels:
+            if not prev_char_was_vowel:
+                count += 1
+            prev_char_was_vowel = True
+        else:
+            prev_char_was_vowel = False
+
+    if word.endswith("e") and count > 1:
+        count -= 1
+
+    return max(1, count)
+
+
+def test_syllable_counts_match_scalar_loop():
+    """
+    测试Numba内核与未安装Numba时的NumPy回退结果都与逐词计数一致
+    """
+    print("=== 音节计数测试 ===")
+
+    expected = [_count_syllables(word) for word in WORDS]
+    assert _count_syllables_array(WORDS).tolist() == expected
+    assert _count_syllables_array(["the"]).tolist() == [1]
+    assert _count_syllables_array([]).tolist() == []
+
+    jit = text_linguistics_analysis._syllable_counts_jit
+    try:
+        text_linguistics_analysis._syllable_counts_jit = None
+        assert _count_syllables_array(WORDS).tolist() == expected, "NumPy回退的音节数与逐词计数不一致"
+        assert _count_syllables_array([""]).tolist() == [1]
+    finally:
+        text_linguistics_analysis._syllable_counts_jit = jit
+
+    print("音节计数测试成功!")
+
+
+if __name__ == "__main__":
+    test_syllable_counts_match_scalar_loop()
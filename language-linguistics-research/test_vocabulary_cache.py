@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试词汇分析的逐词缓存不会被调用方修改
+"""
+
+import nltk
+
+from scripts.vocabulary_analysis import VocabularyAnalysis
+
+RELATIONS = ("synonyms", "antonyms", "hyponyms", "hypernyms", "meronyms", "holonyms")
+
+
+def test_relation_lists_are_fresh():
+    """
+    测试修改返回的语义关系列表后，再次查询得到的结果不变
+    """
+    print("=== 语义关系缓存测试 ===")
+
+    analyzer = VocabularyAnalysis(["dog", "dog"], "english")
+    expected = VocabularyAnalysis(["dog"], "english")._gather_relations("dog")
+
+    relations = analyzer._gather_relations("dog")
+    for name in RELATIONS:
+        relations[name].append("corrupted")
+    analyzer._find_synonyms("dog").append("corrupted")
+    assert analyzer._gather_relations("dog") == expected
+    assert analyzer._find_synonyms("dog") == expected["synonyms"]
+
+    print("语义关系缓存测试成功!")
+
+
+def test_semantics_results_are_fresh():
+    """
+    测试修改语义分析结果后，重复词和再次分析得到的结果不变
+    """
+    print("=== 语义分析缓存测试 ===")
+
+    words = ["unhappiness", "running", "unhappiness"]
+    expected = VocabularyAnalysis(words, "english").analyze_semantics()
+
+    analyzer = VocabularyAnalysis(words, "english")
+    semantics = analyzer.analyze_semantics()
+    for name in RELATIONS:
+        semantics["unhappiness"][name].append("corrupted")
+    semantics["running"]["semantic_category"] = "corrupted"
+    assert analyzer.analyze_semantics() == expected
+
+    print("语义分析缓存测试成功!")
+
+
+def test_morphology_results_are_fresh():
+    """
+    测试修改形态分析结果后，重复词、再次分析和词汇特征统计的结果不变
+    """
+    print("=== 形态分析缓存测试 ===")
+
+    try:
+        nltk.data.find('corpora/wordnet')
+    except LookupError:
+        print("缺少NLTK资源corpora/wordnet，形态分析缓存测试: 跳过")
+        return
+
+    words = ["unhappiness", "running", "unhappiness"]
+    expected = VocabularyAnalysis(words, "english").analyze_morphology()
+    expected_features = VocabularyAnalysis(words, "english").analyze_vocabulary_features()
+
+    analyzer = VocabularyAnalysis(words, "english")
+    morphology = analyzer.analyze_morphology()
+    morphology["unhappiness"]["root"] = "corrupted"
+    morphology["unhappiness"]["affixes"]["prefixes"].append("corrupted")
+    morphology["running"]["inflections"].append("corrupted")
+    assert analyzer.analyze_morphology() == expected
+    assert analyzer.analyze_vocabulary_features() == expected_features
+
+    print("形态分析缓存测试成功!")
+
+
+if __name__ == "__main__":
+    test_relation_lists_are_fresh()
+    test_semantics_results_are_fresh()
+    test_morphology_results_are_fresh()
@@ -6,6 +6,7 @@
 """
 
 import os
+import re
 import zipfile
 import shutil
 import json
@@ -43,26 +44,44 @@ EXCLUDE_PATHS = [
 ]
 
 
+def compile_exclude_patterns(patterns):
+    """
+    将排除规则编译为一个正则表达式
+    
+    不含通配符的规则匹配完整的路径组成部分（目录名或文件名），
+    含"*"的规则按glob语义匹配单个路径组成部分（如"*.pyc"匹配任意目录下的.pyc文件）。
+    """
+    alternatives = [re.escape(pattern).replace(r"\*", "[^/]*") for pattern in patterns]
+    return re.compile(r"(?:^|/)(?:" + "|".join(alternatives) + r")(?:/|$)")
+
+
+EXCLUDE_RE = compile_exclude_patterns(EXCLUDE_PATHS)
+
+
 def create_output_directory():
     """创建输出目录"""
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
-    else:
-        # 清空输出目录
-        for item in os.listdir(OUTPUT_DIR):
-            item_path = os.path.join(OUTPUT_DIR, item)
-            if os.path.isfile(item_path):
-                os.remove(item_path)
-            elif os.path.isdir(item_path):
-                shutil.rmtree(item_path)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    
+    # 清空输出目录：scandir返回的条目自带类型信息，无需逐个stat
+    with os.scandir(OUTPUT_DIR) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.remove(entry.path)
 
 
 def should_exclude(path):
     """判断是否应该排除文件或目录"""
-    for exclude_pattern in EXCLUDE_PATHS:
-        if exclude_pattern in path:
-            return True
-    return False
+    return EXCLUDE_RE.search(path.replace(os.sep, "/")) is not None
+
+
+def add_file_to_zip(zipf, file_path, arcname):
+    """以1MiB分块流式写入单个文件，大文件也不会整体读入内存"""
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    zinfo.compress_type = zipf.compression
+    with open(file_path, "rb") as src, zipf.open(zinfo, "w", force_zip64=True) as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
 
 
 def create_skill_zip():
@@ -82,19 +101,19 @@ def create_skill_zip():
                 # 添加单个文件
                 arcname = os.path.relpath(include_full_path, SKILL_ROOT)
                 if not should_exclude(arcname):
-                    zipf.write(include_full_path, arcname)
+                    add_file_to_zip(zipf, include_full_path, arcname)
                     print(f"添加文件: {arcname}")
             elif os.path.isdir(include_full_path):
                 # 递归添加目录
                 for root, dirs, files in os.walk(include_full_path):
                     # 过滤目录
-                    dirs[:] = [d for d in dirs if not should_exclude(os.path.join(root, d))]
+                    dirs[:] = [d for d in dirs if not should_exclude(os.path.relpath(os.path.join(root, d), SKILL_ROOT))]
                     
                     for file in files:
                         file_path = os.path.join(root, file)
                         arcname = os.path.relpath(file_path, SKILL_ROOT)
                         if not should_exclude(arcname):
-                            zipf.write(file_path, arcname)
+                            add_file_to_zip(zipf, file_path, arcname)
                             print(f"添加文件: {arcname}")
     
     print(f"\n技能包已创建: {zip_path}")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# 分析模块共用的矩阵构建与图表保存工具
+
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+# 不按内容裁剪时保存图表使用的固定边距
+_SAVE_MARGINS = {'left': 0.08, 'right': 0.95, 'top': 0.92, 'bottom': 0.15}
+
+
+def to_matrix(data, sort_columns=False, missing=0, dtype=np.float64):
+    """
+    将{行: {列: 值}}形式的嵌套字典转换为稠密矩阵，缺失值填missing
+
+    列默认按首次出现的顺序排列。dtype为np.int8时只在所有取值都是int8范围内的整数时生效，
+    否则退回float64，小数或超出范围的取值不会被截断。
+    """
+    df = pd.DataFrame.from_dict(data, orient='index')
+    # 没有任何取值的行不会出现在from_dict的结果中，需要按原顺序补回
+    columns = list(dict.fromkeys(chain.from_iterable(data.values())))
+    if sort_columns:
+        columns.sort()
+    df = df.reindex(index=list(data), columns=columns).fillna(missing)
+
+    if np.dtype(dtype) != np.int8:
+        return df.index.tolist(), df.columns.tolist(), df.to_numpy(dtype=dtype)
+
+    matrix = df.to_numpy(dtype=np.float64)
+    int8_info = np.iinfo(np.int8)
+    if matrix.size and np.array_equal(matrix, np.trunc(matrix)) \
+            and int8_info.min <= matrix.min() and matrix.max() <= int8_info.max:
+        matrix = matrix.astype(np.int8)
+    return df.index.tolist(), df.columns.tolist(), matrix
+
+
+def symmetric_adjacency(G):
+    """
+    由图的边构建按G.nodes顺序排列的对称0/1稀疏邻接矩阵（LIL格式），有向边按无向处理，自环忽略
+
+    供fa2的forceatlas2使用；不依赖networkx 2.7才加入的to_scipy_sparse_array。
+    """
+    node_index = {node: i for i, node in enumerate(G.nodes)}
+    pairs = np.array([(node_index[u], node_index[v]) for u, v in G.edges() if u != v], dtype=np.int64).reshape(-1, 2)
+    rows = np.concatenate([pairs[:, 0], pairs[:, 1]])
+    cols = np.concatenate([pairs[:, 1], pairs[:, 0]])
+    adjacency = csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(node_index), len(node_index)))
+    # 双向边在转换时会被累加，统一置为1
+    adjacency.data[:] = 1.0
+    return adjacency.tolil()
+
+
+def _savefig_kwargs(output_path):
+    """PNG输出使用低压缩级别，以较大的文件换取更快的编码"""
+    if str(output_path).lower().endswith('.png'):
+        return {'pil_kwargs': {'compress_level': 1}}
+    return {}
+
+
+def save_figure(fig, output_path, dpi, tight):
+    """保存图表；tight为True时按内容裁剪，否则使用固定边距"""
+    if tight:
+        fig.savefig(output_path, dpi=dpi, bbox_inches='tight', **_savefig_kwargs(output_path))
+    else:
+        # 使用固定边距，省去bbox_inches='tight'为测量所有元素范围而做的额外渲染
+        fig.subplots_adjust(**_SAVE_MARGINS)
+        fig.savefig(output_path, dpi=dpi, **_savefig_kwargs(output_path))
@@ -7,12 +7,207 @@
 """
 
 import re
+from functools import lru_cache
 import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
+from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# NLTK资源只需在进程内下载一次
+_NLTK_RESOURCES = ('punkt', 'punkt_tab', 'stopwords', 'wordnet', 'averaged_perceptron_tagger')
+_NLTK_READY = False
+
+
+def _ensure_nltk_resources():
+    """
+    下载论证分析所需的NLTK资源（每个进程只执行一次）
+    """
+    global _NLTK_READY
+    if _NLTK_READY:
+        return
+    
+    try:
+        for resource in _NLTK_RESOURCES:
+            nltk.download(resource, quiet=True)
+    except Exception as e:
+        print(f"加载NLTK资源时出错: {e}")
+    _NLTK_READY = True
+
+
+@lru_cache(maxsize=1)
+def _get_sentence_tokenizer():
+    """
+    获取缓存的英文Punkt分句器，避免每次分句重新加载模型
+    
+    Returns:
+        nltk.tokenize.PunktSentenceTokenizer: 分句器
+    """
+    try:
+        from nltk.tokenize import PunktTokenizer
+    except ImportError:
+        # 旧版NLTK通过pickle加载预训练模型
+        return nltk.data.load('tokenizers/punkt/english.pickle')
+    return PunktTokenizer('english')
+
+
+# 超过该长度的文本优先使用spaCy的规则分句器
+SPACY_MIN_CHARS = 1_000_000
+
+
+@lru_cache(maxsize=1)
+def _get_spacy_sentencizer():
+    """
+    获取只包含sentencizer组件的空白spaCy管道
+    
+    Returns:
+        spacy.language.Language: spaCy管道，spaCy不可用时返回None
+    """
+    try:
+        import spacy
+        nlp = spacy.blank('en')
+        nlp.add_pipe('sentencizer')
+    except Exception as e:
+        print(f"导入spacy时出错: {e}")
+        return None
+    return nlp
+
+# 论证标记词
+PREMISE_MARKERS = (
+    'because', 'since', 'as', 'for', 'given that', 'assuming that',
+    'due to', 'owing to', 'on account of', 'in view of', 'considering that',
+    'firstly', 'secondly', 'thirdly', 'finally', 'furthermore', 'moreover',
+    'additionally', 'in addition', 'besides', 'what is more'
+)
+
+CONCLUSION_MARKERS = (
+    'therefore', 'thus', 'hence', 'consequently', 'as a result', 'so',
+    'it follows that', 'we can conclude that', 'thus we see that',
+    'in conclusion', 'to conclude', 'finally', 'accordingly', 'henceforth',
+    'ergo', 'thereby', 'wherefore'
+)
+
+# 推理类型标记词（按优先级排列）
+INDUCTIVE_MARKERS = (
+    'probably', 'likely', 'most likely', 'chances are',
+    'it is probable that', 'it is likely that', 'we can infer that'
+)
+
+DEDUCTIVE_MARKERS = (
+    'necessarily', 'must', 'certainly', 'absolutely',
+    'it necessarily follows that', 'it must be that'
+)
+
+ANALOGICAL_MARKERS = (
+    'like', 'as', 'similar to', 'analogous to',
+    'by analogy', 'in the same way', 'just as'
+)
+
+# 连锁论证标记词
+CHAIN_MARKERS = ('therefore', 'thus')
+
+
+def _compile_markers(markers):
+    """
+    将标记词编译为按词边界匹配的正则交替式
+    
+    Args:
+        markers (tuple): 标记词列表
+        
+    Returns:
+        re.Pattern: 编译后的正则表达式
+    """
+    return re.compile(r'\b(?:' + '|'.join(map(re.escape, markers)) + r')\b')
+
+
+PREMISE_RE = _compile_markers(PREMISE_MARKERS)
+CONCLUSION_RE = _compile_markers(CONCLUSION_MARKERS)
+INDUCTIVE_RE = _compile_markers(INDUCTIVE_MARKERS)
+DEDUCTIVE_RE = _compile_markers(DEDUCTIVE_MARKERS)
+ANALOGICAL_RE = _compile_markers(ANALOGICAL_MARKERS)
+CHAIN_RE = _compile_markers(CHAIN_MARKERS)
+
+
+def _build_marker_automaton(category_markers):
+    """
+    为各类标记词构建一个共享的Aho-Corasick自动机
+    
+    Args:
+        category_markers (dict): 类别到标记词列表的映射
+        
+    Returns:
+        ahocorasick.Automaton: 自动机，每个标记词对应其所属类别的frozenset；
+            未安装pyahocorasick时返回None
+    """
+    if ahocorasick is None:
+        return None
+    
+    marker_categories = {}
+    for category, markers in category_markers.items():
+        for marker in markers:
+            marker_categories.setdefault(marker, set()).add(category)
+    
+    automaton = ahocorasick.Automaton()
+    for marker, categories in marker_categories.items():
+        automaton.add_word(marker, (len(marker), frozenset(categories)))
+    automaton.make_automaton()
+    return automaton
+
+
+# 前提和结论标记词共用一个自动机（如'finally'同属两类），每个句子只扫描一次
+_ARGUMENT_MARKER_AC = _build_marker_automaton({
+    'premise': PREMISE_MARKERS,
+    'conclusion': CONCLUSION_MARKERS
+})
+
+
+def _is_word_char(char):
+    """
+    判断字符是否属于正则中的单词字符（\\w）
+    
+    Args:
+        char (str): 单个字符
+        
+    Returns:
+        bool: 是否为单词字符
+    """
+    return char.isalnum() or char == '_'
+
+
+def _is_conclusion_sentence(text):
+    """
+    判断句子是否为结论：含完整的结论标记词且不含前提标记词（前提标记词优先）
+    
+    Args:
+        text (str): 小写句子
+        
+    Returns:
+        bool: 是否为结论句
+    """
+    if _ARGUMENT_MARKER_AC is None:
+        return PREMISE_RE.search(text) is None and CONCLUSION_RE.search(text) is not None
+    
+    has_conclusion_marker = False
+    for end, (length, categories) in _ARGUMENT_MARKER_AC.iter(text):
+        # 自动机按子串命中，需与正则一样检查词边界
+        start = end - length + 1
+        if start > 0 and _is_word_char(text[start - 1]):
+            continue
+        if end + 1 < len(text) and _is_word_char(text[end + 1]):
+            continue
+        if 'premise' in categories:
+            return False
+        has_conclusion_marker = True
+    return has_conclusion_marker
+
 
 class ArgumentAnalyzer:
     """
@@ -31,17 +226,14 @@ class ArgumentAnalyzer:
         self.text_content = text_content
         self.text = None
         self.sentences = []
+        self.sentences_lower = []
         self.arguments = []
         self.argument_graph = None
+        # 按论证索引缓存的结构分析结果
+        self._analyses = {}
         
         # 加载NLTK资源
-        try:
-            nltk.download('punkt', quiet=True)
-            nltk.download('stopwords', quiet=True)
-            nltk.download('wordnet', quiet=True)
-            nltk.download('averaged_perceptron_tagger', quiet=True)
-        except Exception as e:
-            print(f"加载NLTK资源时出错: {e}")
+        _ensure_nltk_resources()
         
         # 加载文本
         if text_path:
@@ -50,6 +242,36 @@ class ArgumentAnalyzer:
             self.text = text_content
             self.process_text()
     
+    @classmethod
+    def analyze_many(cls, texts, batch_size=64, n_process=1):
+        """
+        批量分析多篇文本，使用spaCy管道批量分句
+        
+        Args:
+            texts (list): 文本内容列表
+            batch_size (int, optional): spaCy每批处理的文本数
+            n_process (int, optional): spaCy分句使用的进程数，-1表示使用全部CPU核心
+            
+        Returns:
+            list: 已提取论证的分析器列表，与texts一一对应
+        """
+        texts = list(texts)
+        nlp = _get_spacy_sentencizer()
+        if nlp is None:
+            analyzers = [cls(text_content=text) for text in texts]
+        else:
+            nlp.max_length = max([nlp.max_length] + [len(text) + 1 for text in texts])
+            analyzers = []
+            for text, doc in zip(texts, nlp.pipe(texts, batch_size=batch_size, n_process=n_process)):
+                analyzer = cls()
+                analyzer.text = text
+                analyzer._set_sentences([(sent.start_char, sent.end_char) for sent in doc.sents])
+                analyzers.append(analyzer)
+        
+        for analyzer in analyzers:
+            analyzer.extract_arguments()
+        return analyzers
+    
     def load_text_from_file(self, file_path):
         """
         从文件加载文本
@@ -72,8 +294,32 @@ class ArgumentAnalyzer:
         if not self.text:
             return
         
-        # 分句
-        self.sentences = sent_tokenize(self.text)
+        # 分句（大型语料使用spaCy，否则使用NLTK）
+        nlp = _get_spacy_sentencizer() if len(self.text) >= SPACY_MIN_CHARS else None
+        if nlp is not None:
+            nlp.max_length = max(nlp.max_length, len(self.text) + 1)
+            spans = [(sent.start_char, sent.end_char) for sent in nlp(self.text).sents]
+        else:
+            spans = _get_sentence_tokenizer().span_tokenize(self.text)
+        self._set_sentences(spans)
+    
+    def _set_sentences(self, spans):
+        """
+        按句子在原文中的位置切分原文和小写文本
+        
+        Args:
+            spans (iterable): 句子的(起始, 结束)字符位置
+        """
+        spans = list(spans)
+        self.sentences = [self.text[start:end] for start, end in spans]
+        
+        # 整篇文本只转换一次小写。纯ASCII文本（最常见的英文译本）走CPython的ASCII快速路径，
+        # 且小写后长度必然不变；其他文本中个别Unicode字符小写后长度会变化，此时无法按位置切分
+        lower_text = self.text.lower()
+        if self.text.isascii() or len(lower_text) == len(self.text):
+            self.sentences_lower = [lower_text[start:end] for start, end in spans]
+        else:
+            self.sentences_lower = [sentence.lower() for sentence in self.sentences]
     
     def extract_arguments(self):
         """
@@ -85,76 +331,56 @@ class ArgumentAnalyzer:
         if not self.sentences:
             return []
         
-        # 识别论证标记词
-        premise_markers = [
-            'because', 'since', 'as', 'for', 'given that', 'assuming that',
-            'due to', 'owing to', 'on account of', 'in view of', 'considering that',
-            'firstly', 'secondly', 'thirdly', 'finally', 'furthermore', 'moreover',
-            'additionally', 'in addition', 'besides', 'what is more'
-        ]
-        
-        conclusion_markers = [
-            'therefore', 'thus', 'hence', 'consequently', 'as a result', 'so',
-            'it follows that', 'we can conclude that', 'thus we see that',
-            'in conclusion', 'to conclude', 'finally', 'accordingly', 'henceforth',
-            'ergo', 'therefore', 'thereby', 'wherefore'
-        ]
-        
-        # 提取论证
-        arguments = []
-        current_argument = {
-            'premises': [],
-            'conclusion': None,
-            'inference_type': 'deductive',  # 默认推理类型
-            'sentence_indices': []
-        }
+        # 句子列表被外部替换时重新生成小写版本
+        sentences = self.sentences
+        sentences_lower = self.sentences_lower
+        if len(sentences_lower) != len(sentences):
+            sentences_lower = [sentence.lower() for sentence in sentences]
         
-        for i, sentence in enumerate(self.sentences):
-            sentence_lower = sentence.lower()
-            
-            # 检查是否包含结论标记词
-            contains_conclusion_marker = any(marker in sentence_lower for marker in conclusion_markers)
-            
-            # 检查是否包含前提标记词
-            contains_premise_marker = any(marker in sentence_lower for marker in premise_markers)
-            
-            if contains_premise_marker:
-                # 这是一个前提
-                current_argument['premises'].append(sentence)
-                current_argument['sentence_indices'].append(i)
-            elif contains_conclusion_marker:
-                # 这是一个结论
-                current_argument['conclusion'] = sentence
-                current_argument['sentence_indices'].append(i)
-                
-                # 完成当前论证并添加到列表
-                if current_argument['premises'] and current_argument['conclusion']:
-                    arguments.append(current_argument.copy())
-                    # 重置当前论证
-                    current_argument = {
-                        'premises': [],
-                        'conclusion': None,
-                        'inference_type': 'deductive',
-                        'sentence_indices': []
-                    }
-            else:
-                # 可能是论证的一部分，需要根据上下文判断
-                # 这里简单处理，将其添加到当前论证的前提中
-                current_argument['premises'].append(sentence)
-                current_argument['sentence_indices'].append(i)
+        # 标记每个句子是否为结论：含结论标记词且不含前提标记词（含前提标记词的句子优先视为前提），
+        # 其余句子（包括无标记词的句子）都作为当前论证的前提
+        is_conclusion = np.fromiter(
+            (_is_conclusion_sentence(sentence_lower) for sentence_lower in sentences_lower),
+            dtype=bool, count=len(sentences_lower)
+        )
+        
+        # 按结论句的位置批量切分论证
+        arguments = []
+        start = 0  # 当前论证的第一个句子
+        previous = -1  # 上一个结论句
+        for index in np.flatnonzero(is_conclusion).tolist():
+            # 上一个结论句之后有前提才构成完整论证；否则该结论暂时保留在当前论证中
+            if index > previous + 1:
+                arguments.append({
+                    'premises': sentences[previous + 1:index],
+                    'conclusion': sentences[index],
+                    'inference_type': 'deductive',  # 默认推理类型
+                    'sentence_indices': list(range(start, index + 1))
+                })
+                start = index + 1
+            previous = index
         
         # 添加最后一个论证（如果有）
-        if current_argument['premises']:
+        premises = sentences[previous + 1:]
+        if premises:
+            conclusion = sentences[previous] if start <= previous else None
+            
             # 如果没有明确的结论，尝试从前提中推断
-            if not current_argument['conclusion'] and len(current_argument['premises']) > 1:
+            if not conclusion and len(premises) > 1:
                 # 假设最后一个前提是结论
-                current_argument['conclusion'] = current_argument['premises'][-1]
-                current_argument['premises'] = current_argument['premises'][:-1]
+                conclusion = premises[-1]
+                premises = premises[:-1]
             
-            if current_argument['conclusion']:
-                arguments.append(current_argument)
+            if conclusion:
+                arguments.append({
+                    'premises': premises,
+                    'conclusion': conclusion,
+                    'inference_type': 'deductive',
+                    'sentence_indices': list(range(start, len(sentences)))
+                })
         
         self.arguments = arguments
+        self._analyses = {}
         return arguments
     
     def analyze_argument_structure(self, argument):
@@ -192,23 +418,11 @@ class ArgumentAnalyzer:
         
         conclusion = argument.get('conclusion', '').lower()
         
-        # 归纳推理标记词
-        inductive_markers = ['probably', 'likely', 'most likely', 'chances are',
-                           'it is probable that', 'it is likely that', 'we can infer that']
-        
-        # 演绎推理标记词
-        deductive_markers = ['necessarily', 'must', 'certainly', 'absolutely',
-                            'it necessarily follows that', 'it must be that']
-        
-        # 类比推理标记词
-        analogical_markers = ['like', 'as', 'similar to', 'analogous to',
-                            'by analogy', 'in the same way', 'just as']
-        
-        if any(marker in conclusion for marker in inductive_markers):
+        if INDUCTIVE_RE.search(conclusion):
             return 'inductive'
-        elif any(marker in conclusion for marker in deductive_markers):
+        elif DEDUCTIVE_RE.search(conclusion):
             return 'deductive'
-        elif any(marker in conclusion for marker in analogical_markers):
+        elif ANALOGICAL_RE.search(conclusion):
             return 'analogical'
         else:
             # 默认推理类型
@@ -232,7 +446,7 @@ class ArgumentAnalyzer:
             return 'single premise'
         else:
             # 检查是否是连锁论证
-            is_chain = any('therefore' in premise.lower() or 'thus' in premise.lower() for premise in premises)
+            is_chain = any(CHAIN_RE.search(premise.lower()) for premise in premises)
             if is_chain:
                 return 'chain argument'
             else:
@@ -297,6 +511,28 @@ class ArgumentAnalyzer:
         self.argument_graph = G
         return G
     
+    def _hierarchical_layout(self, graph):
+        """
+        按前提→论证→结论三列排布节点，每列在竖直方向居中
+        
+        Args:
+            graph (networkx.DiGraph): 论证图谱
+            
+        Returns:
+            dict: 节点到(x, y)坐标的映射
+        """
+        column_of_type = {'premise': 0, 'argument': 1, 'conclusion': 2}
+        columns = {}
+        for node, node_type in graph.nodes(data='type'):
+            columns.setdefault(column_of_type.get(node_type, 3), []).append(node)
+        
+        pos = {}
+        for x, nodes in columns.items():
+            offset = (len(nodes) - 1) / 2
+            for index, node in enumerate(nodes):
+                pos[node] = (x, offset - index)
+        return pos
+    
     def visualize_arguments(self, output_path=None):
         """
         可视化论证结构
@@ -312,50 +548,54 @@ class ArgumentAnalyzer:
         
         try:
             # 创建图形
-            plt.figure(figsize=(12, 8))
+            fig, ax = plt.subplots(figsize=(12, 8))
             
             # 使用层次布局
-            pos = nx.spring_layout(self.argument_graph, k=0.3, iterations=50)
-            
-            # 绘制节点
-            node_types = nx.get_node_attributes(self.argument_graph, 'type')
-            node_colors = []
-            for node, node_type in node_types.items():
-                if node_type == 'argument':
-                    node_colors.append('lightblue')
-                elif node_type == 'premise':
-                    node_colors.append('lightgreen')
-                elif node_type == 'conclusion':
-                    node_colors.append('lightcoral')
-                else:
-                    node_colors.append('lightgray')
+            pos = self._hierarchical_layout(self.argument_graph)
             
-            nx.draw_networkx_nodes(
-                self.argument_graph, pos, node_size=3000, node_color=node_colors
-            )
+            # 绘制节点（所有节点合并为一次scatter调用）
+            type_colors = {'argument': 'lightblue', 'premise': 'lightgreen', 'conclusion': 'lightcoral'}
+            nodes = list(self.argument_graph.nodes(data='type'))
+            node_xy = np.array([pos[node] for node, _ in nodes], dtype=float).reshape(-1, 2)
+            node_colors = [type_colors.get(node_type, 'lightgray') for _, node_type in nodes]
+            ax.scatter(node_xy[:, 0], node_xy[:, 1], s=3000, c=node_colors, zorder=2)
+            ax.margins(0.1)
             
-            # 绘制边
-            nx.draw_networkx_edges(
-                self.argument_graph, pos, edge_color='gray', arrows=True, arrowstyle='->'
-            )
+            # 绘制边（所有边合并为一个LineCollection，箭头用一次quiver画在边的中点）
+            segments = np.array(
+                [(pos[u], pos[v]) for u, v in self.argument_graph.edges()], dtype=float
+            ).reshape(-1, 2, 2)
+            ax.add_collection(LineCollection(segments, colors='gray', linewidths=1, zorder=1))
+            if len(segments):
+                midpoints = segments.mean(axis=1)
+                directions = segments[:, 1] - segments[:, 0]
+                directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+                ax.quiver(
+                    midpoints[:, 0], midpoints[:, 1], directions[:, 0], directions[:, 1],
+                    color='gray', angles='xy', scale_units='xy', scale=10, pivot='mid',
+                    width=0.003, headwidth=5, headlength=6, zorder=1
+                )
             
             # 绘制标签
             labels = {node: node for node in self.argument_graph.nodes()}
             nx.draw_networkx_labels(
-                self.argument_graph, pos, labels=labels, font_size=10
+                self.argument_graph, pos, labels=labels, font_size=10, ax=ax
             )
             
             # 设置标题
-            plt.title('Argument Structure Visualization')
-            plt.axis('off')
-            plt.tight_layout()
+            ax.set_title('Argument Structure Visualization')
+            ax.axis('off')
+            
+            # 保存时bbox_inches='tight'已按内容裁剪，只在不保存时调用tight_layout
+            if not output_path:
+                fig.tight_layout()
             
             # 保存图表
             if output_path:
-                plt.savefig(output_path, dpi=300, bbox_inches='tight')
+                fig.savefig(output_path, dpi=300, bbox_inches='tight')
                 print(f"成功保存论证可视化到: {output_path}")
             
-            return plt.gcf()
+            return fig
         except Exception as e:
             print(f"可视化论证时出错: {e}")
             return None
@@ -374,25 +614,24 @@ class ArgumentAnalyzer:
             return "论证不存在"
         
         argument = self.arguments[argument_index]
-        analysis = self.analyze_argument_structure(argument)
+        analysis = self._analyses.get(argument_index)
+        if analysis is None:
+            analysis = self._analyses[argument_index] = self.analyze_argument_structure(argument)
         
-        summary = f"论证 {argument_index + 1}:\n"
-        summary += "=" * 50 + "\n"
-        summary += "前提:\n"
-        for i, premise in enumerate(argument['premises']):
-            summary += f"  {i+1}. {premise}\n"
+        parts = [f"论证 {argument_index + 1}:\n", "=" * 50 + "\n", "前提:\n"]
+        parts.extend(f"  {i+1}. {premise}\n" for i, premise in enumerate(argument['premises']))
         
         if argument['conclusion']:
-            summary += "\n结论:\n"
-            summary += f"  {argument['conclusion']}\n"
+            parts.append("\n结论:\n")
+            parts.append(f"  {argument['conclusion']}\n")
         
-        summary += "\n分析:\n"
-        summary += f"  推理类型: {analysis['inference_type']}\n"
-        summary += f"  逻辑结构: {analysis['logical_structure']}\n"
-        summary += f"  论证强度: {analysis['strength']}\n"
-        summary += f"  前提数量: {analysis['premise_count']}\n"
+        parts.append("\n分析:\n")
+        parts.append(f"  推理类型: {analysis['inference_type']}\n")
+        parts.append(f"  逻辑结构: {analysis['logical_structure']}\n")
+        parts.append(f"  论证强度: {analysis['strength']}\n")
+        parts.append(f"  前提数量: {analysis['premise_count']}\n")
         
-        return summary
+        return ''.join(parts)
     
     def save_analysis(self, output_path):
         """
@@ -409,14 +648,15 @@ class ArgumentAnalyzer:
             import os
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
-            # 保存分析结果
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write("论证分析结果\n")
-                f.write("=" * 50 + "\n\n")
-                
-                for i, argument in enumerate(self.arguments):
-                    f.write(self.generate_argument_summary(i))
-                    f.write("\n" + "-" * 50 + "\n\n")
+            # 保存分析结果（先拼接完整内容，再一次性写入）
+            separator = "\n" + "-" * 50 + "\n\n"
+            parts = ["论证分析结果\n", "=" * 50 + "\n\n"]
+            for i in range(len(self.arguments)):
+                parts.append(self.generate_argument_summary(i))
+                parts.append(separator)
+            
+            with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.write(''.join(parts))
             
             print(f"成功保存分析结果到: {output_path}")
         except Exception as e:
@@ -1,202 +1,220 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 from collections import defaultdict
 from scipy import stats
 
+# 公共工具模块位于上级scripts目录；加入搜索路径后，直接运行本脚本与作为scripts包的子模块导入都能找到它
+_SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
+
+from analysis_utils import to_matrix
+
+
+def _new_figure(figsize, interactive, polar=False):
+    """创建画布；只保存文件时直接构造Figure，不经过pyplot的全局图形列表和GUI后端"""
+    subplot_kw = {'projection': 'polar'} if polar else None
+    if interactive:
+        return plt.subplots(figsize=figsize, subplot_kw=subplot_kw)
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots(subplot_kw=subplot_kw)
+
+
+def _save_or_show(fig, output_path, message):
+    """有输出路径时保存图表，否则交互显示，最后释放画布"""
+    if output_path:
+        # bbox_inches='tight'已按内容裁剪，无需再调用tight_layout重复渲染
+        fig.savefig(output_path, dpi=300, bbox_inches='tight')
+        print(f"{message}: {output_path}")
+    else:
+        fig.tight_layout()
+        plt.show()
+    
+    plt.close(fig)
+
+
+def _annotation_kwargs(matrix, max_cells):
+    """小矩阵在热力图上标注数值；单元格过多时关闭标注，避免为每个单元格创建文本对象"""
+    if matrix.size > max_cells:
+        return {'annot': False}
+    return {'annot': True, 'fmt': 'd' if matrix.dtype.kind in 'iu' else '.2g'}
+
+
+def _linregress_rows(x, y):
+    """对矩阵的每一行同时做一元线性回归，结果与逐行调用stats.linregress一致"""
+    n = x.size
+    x_dev = x - x.mean()
+    y_mean = y.mean(axis=1)
+    y_dev = y - y_mean[:, None]
+    ssxm = np.mean(x_dev ** 2)
+    ssym = np.mean(y_dev ** 2, axis=1)
+    ssxym = y_dev @ x_dev / n
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 分母为0时与linregress相同：协方差也为0则r为nan，否则为0
+        degenerate = (ssxm == 0.0) | (ssym == 0.0)
+        r = np.where(degenerate, np.where(ssxym == 0, np.nan, 0.0), ssxym / np.sqrt(ssxm * ssym))
+        r = np.clip(r, -1.0, 1.0)
+        slope = ssxym / ssxm
+        intercept = y_mean - slope * x.mean()
+        
+        if n == 2:
+            p_value = np.where(y[:, 0] == y[:, 1], 1.0, 0.0)
+            std_err = np.zeros_like(slope)
+        else:
+            df = n - 2
+            tiny = 1.0e-20
+            t = r * np.sqrt(df / ((1.0 - r + tiny) * (1.0 + r + tiny)))
+            p_value = 2 * stats.t.sf(np.abs(t), df)
+            std_err = np.sqrt((1 - r ** 2) * ssym / ssxm / df)
+    
+    return slope, intercept, r, p_value, std_err
+
+
 class ConceptApplicationAnalyzer:
+    # 最多缓存的矩阵数量
+    MATRIX_CACHE_SIZE = 8
+    # 热力图标注数值的最大单元格数
+    ANNOTATION_MAX_CELLS = 200
+    
     def __init__(self):
-        pass
+        self._matrix_cache = {}
+    
+    def _build_matrix(self, data, sort_columns=False):
+        """构建概念矩阵并按数据内容缓存，同一份数据在多个分析方法间只转换一次"""
+        key = (sort_columns, tuple((concept, tuple(values.items())) for concept, values in data.items()))
+        cached = self._matrix_cache.get(key)
+        if cached is None:
+            # 应用强度等评分通常是小整数，此时改用int8存储，内存占用只有float64的1/8
+            concepts, columns, matrix = to_matrix(data, sort_columns, dtype=np.int8)
+            # 缓存的矩阵在多次调用间共享，禁止原地修改
+            matrix.flags.writeable = False
+            if len(self._matrix_cache) >= self.MATRIX_CACHE_SIZE:
+                self._matrix_cache.pop(next(iter(self._matrix_cache)))
+            cached = self._matrix_cache[key] = (concepts, columns, matrix)
+        return cached
     
     def analyze_concept_applications(self, application_data, output_path=None, figsize=(14, 10)):
         """分析概念在不同领域的应用"""
-        # 准备数据
-        concepts = list(application_data.keys())
-        domains = list(set(domain for concept in application_data.values() for domain in concept.keys()))
+        # 准备数据，创建概念-领域矩阵
+        concepts, domains, matrix = self._build_matrix(application_data)
         
-        # 创建概念-领域矩阵
-        n_concepts = len(concepts)
-        n_domains = len(domains)
-        matrix = np.zeros((n_concepts, n_domains))
-        
-        for i, concept in enumerate(concepts):
-            for j, domain in enumerate(domains):
-                if domain in application_data[concept]:
-                    matrix[i, j] = application_data[concept][domain]
+        # 分析概念在不同领域的应用强度（按行一次性计算所有概念的统计量）
+        mean_applications = matrix.mean(axis=1)
+        std_applications = matrix.std(axis=1)
+        # 缓存的矩阵可能以int8存储，返回给调用方的数值统一转换为float64
+        max_applications = matrix.max(axis=1).astype(np.float64)
+        dominant_indices = matrix.argmax(axis=1)
         
-        # 分析概念在不同领域的应用强度
         application_analysis = {}
-        for i, concept in enumerate(concepts):
-            values = matrix[i, :]
-            mean_application = np.mean(values)
-            std_application = np.std(values)
-            max_application = np.max(values)
-            dominant_domain = domains[np.argmax(values)] if max_application > 0 else None
+        for i, (concept, values) in enumerate(zip(concepts, matrix.astype(np.float64).tolist())):
+            max_application = max_applications[i]
+            dominant_domain = domains[dominant_indices[i]] if max_application > 0 else None
             
             application_analysis[concept] = {
-                'mean_application': mean_application,
-                'std_application': std_application,
+                'mean_application': mean_applications[i],
+                'std_application': std_applications[i],
                 'max_application': max_application,
                 'dominant_domain': dominant_domain,
-                'values': values.tolist()
+                'values': values
             }
         
         # 绘制热力图
-        plt.figure(figsize=figsize)
-        sns.heatmap(matrix, annot=True, cmap='viridis', xticklabels=domains, yticklabels=concepts, cbar_kws={'label': 'Application Strength'})
-        plt.title('Concept Applications Across Domains')
-        plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"概念应用分析已保存至: {output_path}")
-        else:
-            plt.show()
-        
-        plt.close()
+        fig, ax = _new_figure(figsize, interactive=not output_path)
+        sns.heatmap(matrix, **_annotation_kwargs(matrix, self.ANNOTATION_MAX_CELLS), cmap='viridis', xticklabels=domains, yticklabels=concepts, cbar_kws={'label': 'Application Strength'}, ax=ax)
+        ax.set_title('Concept Applications Across Domains')
+        _save_or_show(fig, output_path, "概念应用分析已保存至")
         
         return application_analysis
     
     def analyze_application_trends(self, trend_data, output_path=None, figsize=(14, 8)):
         """分析概念应用的变化趋势"""
-        # 准备数据
-        concepts = list(trend_data.keys())
-        time_periods = sorted(list(set(period for concept in trend_data.values() for period in concept.keys())))
-        
-        # 创建概念-时间矩阵
+        # 准备数据，创建概念-时间矩阵
+        concepts, time_periods, matrix = self._build_matrix(trend_data, sort_columns=True)
         n_concepts = len(concepts)
         n_periods = len(time_periods)
-        matrix = np.zeros((n_concepts, n_periods))
         
-        for i, concept in enumerate(concepts):
-            for j, period in enumerate(time_periods):
-                if period in trend_data[concept]:
-                    matrix[i, j] = trend_data[concept][period]
+        # 分析趋势（一次性计算所有概念的线性回归）
+        x = np.arange(n_periods, dtype=np.float64)
+        slopes, intercepts, r_values, p_values, std_errs = _linregress_rows(x, matrix)
         
-        # 分析趋势
         trends = {}
         for i, concept in enumerate(concepts):
-            # 计算线性回归斜率
-            x = np.arange(n_periods)
-            y = matrix[i, :]
-            slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
+            slope = slopes[i]
             trends[concept] = {
                 'slope': slope,
-                'r_value': r_value,
-                'p_value': p_value,
-                'std_err': std_err,
+                'r_value': r_values[i],
+                'p_value': p_values[i],
+                'std_err': std_errs[i],
                 'trend_direction': 'increasing' if slope > 0 else 'decreasing' if slope < 0 else 'stable'
             }
         
         # 绘制趋势图
-        plt.figure(figsize=figsize)
+        fig, ax = _new_figure(figsize, interactive=not output_path)
         
         colors = plt.cm.tab20(np.linspace(0, 1, n_concepts))
         
         for i, (concept, color) in enumerate(zip(concepts, colors)):
-            plt.plot(time_periods, matrix[i, :], marker='o', linestyle='-', linewidth=2, color=color, label=concept)
+            ax.plot(time_periods, matrix[i, :], marker='o', linestyle='-', linewidth=2, color=color, label=concept)
             
-            # 添加趋势线
-            x = np.arange(n_periods)
-            y = matrix[i, :]
-            slope, intercept, _, _, _ = stats.linregress(x, y)
-            trend_line = intercept + slope * x
-            plt.plot(time_periods, trend_line, linestyle='--', linewidth=1.5, color=color)
-        
-        plt.title('Concept Application Trends Over Time')
-        plt.xlabel('Time Period')
-        plt.ylabel('Application Strength')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"概念应用趋势分析已保存至: {output_path}")
-        else:
-            plt.show()
-        
-        plt.close()
+            # 添加趋势线（复用上面的回归结果）
+            trend_line = intercepts[i] + slopes[i] * x
+            ax.plot(time_periods, trend_line, linestyle='--', linewidth=1.5, color=color)
+        
+        ax.set_title('Concept Application Trends Over Time')
+        ax.set_xlabel('Time Period')
+        ax.set_ylabel('Application Strength')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+        _save_or_show(fig, output_path, "概念应用趋势分析已保存至")
         
         return trends
     
     def analyze_application_similarities(self, application_data, output_path=None, figsize=(12, 10)):
         """分析不同概念应用模式的相似性"""
-        # 准备数据
-        concepts = list(application_data.keys())
-        domains = list(set(domain for concept in application_data.values() for domain in concept.keys()))
+        # 准备数据，创建概念-领域矩阵
+        concepts, domains, matrix = self._build_matrix(application_data)
         
-        # 创建概念-领域矩阵
-        n_concepts = len(concepts)
-        n_domains = len(domains)
-        matrix = np.zeros((n_concepts, n_domains))
-        
-        for i, concept in enumerate(concepts):
-            for j, domain in enumerate(domains):
-                if domain in application_data[concept]:
-                    matrix[i, j] = application_data[concept][domain]
-        
-        # 计算概念之间的相似度
-        similarity_matrix = np.zeros((n_concepts, n_concepts))
-        for i in range(n_concepts):
-            for j in range(n_concepts):
-                if i != j:
-                    # 计算皮尔逊相关系数
-                    correlation, _ = stats.pearsonr(matrix[i, :], matrix[j, :])
-                    similarity_matrix[i, j] = correlation
-                else:
-                    similarity_matrix[i, j] = 1.0
+        # 计算概念之间的相似度（一次性计算全部行向量的皮尔逊相关系数）
+        similarity_matrix = np.corrcoef(matrix)
+        np.fill_diagonal(similarity_matrix, 1.0)
         
         # 绘制相似度热力图
-        plt.figure(figsize=figsize)
-        sns.heatmap(similarity_matrix, annot=True, cmap='coolwarm', xticklabels=concepts, yticklabels=concepts, vmin=-1, vmax=1)
-        plt.title('Concept Application Similarities')
-        plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"概念应用相似性分析已保存至: {output_path}")
-        else:
-            plt.show()
-        
-        plt.close()
+        fig, ax = _new_figure(figsize, interactive=not output_path)
+        sns.heatmap(similarity_matrix, **_annotation_kwargs(similarity_matrix, self.ANNOTATION_MAX_CELLS), cmap='coolwarm', xticklabels=concepts, yticklabels=concepts, vmin=-1, vmax=1, ax=ax)
+        ax.set_title('Concept Application Similarities')
+        _save_or_show(fig, output_path, "概念应用相似性分析已保存至")
         
         return similarity_matrix
     
     def evaluate_application_effectiveness(self, effectiveness_data, output_path=None, figsize=(14, 8)):
         """评估概念应用的效果"""
-        # 准备数据
-        concepts = list(effectiveness_data.keys())
-        metrics = list(set(metric for concept in effectiveness_data.values() for metric in concept.keys()))
-        
-        # 创建概念-指标矩阵
+        # 准备数据，创建概念-指标矩阵
+        concepts, metrics, matrix = self._build_matrix(effectiveness_data)
         n_concepts = len(concepts)
         n_metrics = len(metrics)
-        matrix = np.zeros((n_concepts, n_metrics))
         
-        for i, concept in enumerate(concepts):
-            for j, metric in enumerate(metrics):
-                if metric in effectiveness_data[concept]:
-                    matrix[i, j] = effectiveness_data[concept][metric]
+        # 评估概念应用效果（按行一次性计算所有概念的统计量）
+        mean_effectiveness = matrix.mean(axis=1)
+        std_effectiveness = matrix.std(axis=1)
+        overall_effectiveness = matrix.sum(axis=1, dtype=np.float64)
         
-        # 评估概念应用效果
         effectiveness_analysis = {}
-        for i, concept in enumerate(concepts):
-            values = matrix[i, :]
-            mean_effectiveness = np.mean(values)
-            std_effectiveness = np.std(values)
-            overall_effectiveness = np.sum(values)
-            
+        for i, (concept, values) in enumerate(zip(concepts, matrix.astype(np.float64).tolist())):
             effectiveness_analysis[concept] = {
-                'mean_effectiveness': mean_effectiveness,
-                'std_effectiveness': std_effectiveness,
-                'overall_effectiveness': overall_effectiveness,
-                'values': values.tolist()
+                'mean_effectiveness': mean_effectiveness[i],
+                'std_effectiveness': std_effectiveness[i],
+                'overall_effectiveness': overall_effectiveness[i],
+                'values': values
             }
         
         # 绘制雷达图
-        plt.figure(figsize=figsize)
+        fig, ax = _new_figure(figsize, interactive=not output_path, polar=True)
         
         # 计算角度
         angles = np.linspace(0, 2 * np.pi, n_metrics, endpoint=False).tolist()
@@ -205,56 +223,30 @@ class ConceptApplicationAnalyzer:
         for i, (concept, color) in enumerate(zip(concepts, plt.cm.tab20(np.linspace(0, 1, n_concepts)))):
             values = matrix[i, :].tolist()
             values += values[:1]  # 闭合图形
-            plt.polar(angles, values, marker='o', linestyle='-', linewidth=2, color=color, label=concept)
-            plt.fill(angles, values, alpha=0.2, color=color)
+            ax.plot(angles, values, marker='o', linestyle='-', linewidth=2, color=color, label=concept)
+            ax.fill(angles, values, alpha=0.2, color=color)
         
         # 添加标签
-        plt.thetagrids(np.degrees(angles[:-1]), metrics)
-        plt.title('Concept Application Effectiveness')
-        plt.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1))
-        plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"概念应用效果评估已保存至: {output_path}")
-        else:
-            plt.show()
-        
-        plt.close()
+        ax.set_thetagrids(np.degrees(angles[:-1]), metrics)
+        ax.set_title('Concept Application Effectiveness')
+        ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1))
+        _save_or_show(fig, output_path, "概念应用效果评估已保存至")
         
         return effectiveness_analysis
     
     def generate_application_heatmap(self, application_data, output_path=None, figsize=(14, 10)):
         """生成概念应用热力图"""
-        # 准备数据
-        concepts = list(application_data.keys())
-        contexts = list(set(context for concept in application_data.values() for context in concept.keys()))
-        
-        # 创建概念-语境矩阵
-        n_concepts = len(concepts)
-        n_contexts = len(contexts)
-        matrix = np.zeros((n_concepts, n_contexts))
-        
-        for i, concept in enumerate(concepts):
-            for j, context in enumerate(contexts):
-                if context in application_data[concept]:
-                    matrix[i, j] = application_data[concept][context]
+        # 准备数据，创建概念-语境矩阵
+        concepts, contexts, matrix = self._build_matrix(application_data)
         
         # 绘制热力图
-        plt.figure(figsize=figsize)
-        sns.heatmap(matrix, annot=True, cmap='viridis', xticklabels=contexts, yticklabels=concepts, cbar_kws={'label': 'Application Strength'})
-        plt.title('Concept Application Heatmap')
-        plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"概念应用热力图已保存至: {output_path}")
-        else:
-            plt.show()
-        
-        plt.close()
+        fig, ax = _new_figure(figsize, interactive=not output_path)
+        sns.heatmap(matrix, **_annotation_kwargs(matrix, self.ANNOTATION_MAX_CELLS), cmap='viridis', xticklabels=contexts, yticklabels=concepts, cbar_kws={'label': 'Application Strength'}, ax=ax)
+        ax.set_title('Concept Application Heatmap')
+        _save_or_show(fig, output_path, "概念应用热力图已保存至")
         
-        return matrix
+        # 返回float64副本，避免调用方在int8矩阵上做运算时溢出回绕
+        return matrix.astype(np.float64)
 
 if __name__ == "__main__":
     # 示例使用
@@ -1,31 +1,107 @@
+import os
+import sys
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.figure import Figure
 from collections import defaultdict
+from functools import lru_cache
+
+# 公共工具模块位于上级scripts目录；加入搜索路径后，直接运行本脚本与作为scripts包的子模块导入都能找到它
+_SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
+
+from analysis_utils import save_figure, symmetric_adjacency, to_matrix
+
+try:
+    from fa2 import ForceAtlas2
+except ImportError:
+    ForceAtlas2 = None
+
+# 概念演变热力图的颜色映射：蓝-青-绿-黄-红
+_EVOLUTION_CMAP = LinearSegmentedColormap.from_list('evolution_cmap', [(0, 0, 1), (0, 1, 1), (0, 1, 0), (1, 1, 0), (1, 0, 0)], N=100)
+
+
+@lru_cache(maxsize=32)
+def _set3_colors(n):
+    """从Set3调色板中均匀取n种颜色，按数量缓存"""
+    colors = plt.cm.Set3(np.linspace(0, 1, n))
+    colors.flags.writeable = False
+    return colors
+
 
 class ConceptVisualizer:
+    # 最多缓存的网络布局数量
+    LAYOUT_CACHE_SIZE = 8
+    # 自动选择布局时，节点数超过该值改用Barnes-Hut近似的ForceAtlas2
+    FA2_MIN_NODES = 500
+    
     def __init__(self):
-        pass
+        self._layout_cache = {}
+        self._figures = {}
+        self._wordclouds = {}
+    
+    def _new_figure(self, figsize, interactive):
+        """创建画布；只保存文件时按尺寸复用不经过pyplot管理的Figure，清空后重新绘制"""
+        if interactive:
+            return plt.subplots(figsize=figsize)
+        key = tuple(figsize)
+        fig = self._figures.get(key)
+        if fig is None:
+            fig = self._figures[key] = Figure(figsize=figsize)
+        else:
+            fig.clf()
+        return fig, fig.add_subplot()
+    
+    def _save_or_show(self, fig, output_path, dpi, tight, message):
+        """有输出路径时保存图表并清空复用的画布，否则交互显示后关闭"""
+        if output_path:
+            save_figure(fig, output_path, dpi, tight)
+            print(f"{message}: {output_path}")
+            fig.clf()
+        else:
+            fig.tight_layout()
+            plt.show()
+            plt.close(fig)
     
-    def visualize_concept_hierarchy(self, hierarchy, output_path=None, figsize=(12, 10), node_size=3000, font_size=10):
+    def _compute_layout(self, G, iterations, backend):
+        """计算网络布局并按节点和边集合缓存，同一网络重复绘制时跳过布局计算"""
+        key = (backend, iterations, frozenset(G.nodes), frozenset(G.edges))
+        pos = self._layout_cache.get(key)
+        if pos is None:
+            use_fa2 = backend == 'fa2' or (backend == 'auto' and G.number_of_nodes() > self.FA2_MIN_NODES)
+            if use_fa2 and ForceAtlas2 is not None:
+                # 旧版fa2的forceatlas2_networkx_layout依赖networkx 3.0已删除的to_scipy_sparse_matrix，
+                # 因此自行构建稀疏邻接矩阵，再按节点顺序取回坐标
+                positions = ForceAtlas2(barnesHutOptimize=True, barnesHutTheta=1.2, verbose=False).forceatlas2(symmetric_adjacency(G), pos=None, iterations=iterations)
+                pos = dict(zip(G.nodes, positions))
+            else:
+                # 节点较多时spring_layout会自动改用scipy稀疏矩阵实现
+                pos = nx.spring_layout(G, k=0.3, iterations=iterations, seed=42)
+            if len(self._layout_cache) >= self.LAYOUT_CACHE_SIZE:
+                self._layout_cache.pop(next(iter(self._layout_cache)))
+            self._layout_cache[key] = pos
+        return pos
+    
+    def visualize_concept_hierarchy(self, hierarchy, output_path=None, figsize=(12, 10), node_size=3000, font_size=10, dpi=150, tight=False):
         """可视化概念层次结构"""
         # 构建层次网络
         G = nx.DiGraph()
         
-        # 递归添加节点和边
-        def add_nodes_edges(parent, children, level=0):
-            for child, grandchildren in children.items():
-                G.add_node(child, level=level+1)
+        # 用显式栈按先序深度优先添加节点和边；子节点逆序入栈，出栈顺序与递归遍历一致
+        for root, children in hierarchy.items():
+            G.add_node(root, level=0)
+            # 叶子节点的子节点可以写作None或空字典，只展开非空的子节点映射
+            stack = [(root, child, grandchildren, 1) for child, grandchildren in reversed((children or {}).items())]
+            while stack:
+                parent, child, grandchildren, level = stack.pop()
+                G.add_node(child, level=level)
                 if parent:
                     G.add_edge(parent, child)
                 if grandchildren:
-                    add_nodes_edges(child, grandchildren, level+1)
-        
-        # 添加根节点和子节点
-        for root, children in hierarchy.items():
-            G.add_node(root, level=0)
-            add_nodes_edges(root, children)
+                    stack.extend((child, grandchild, descendants, level + 1) for grandchild, descendants in reversed(grandchildren.items()))
         
         # 计算布局
         pos = {}
@@ -38,78 +114,53 @@ class ConceptVisualizer:
         max_level = max(levels.keys())
         for level, nodes in levels.items():
             y = 1.0 - (level / (max_level + 1))  # 从顶部到底部
-            n_nodes = len(nodes)
-            for i, node in enumerate(nodes):
-                x = (i + 0.5) / n_nodes  # 水平均匀分布
+            xs = (np.arange(len(nodes)) + 0.5) / len(nodes)  # 水平均匀分布
+            for node, x in zip(nodes, xs.tolist()):
                 pos[node] = (x, y)
         
         # 绘制图形
-        plt.figure(figsize=figsize)
+        fig, ax = self._new_figure(figsize, interactive=not output_path)
         
         # 绘制边
-        nx.draw_networkx_edges(G, pos, arrowstyle='->', arrowsize=20, alpha=0.7)
+        nx.draw_networkx_edges(G, pos, ax=ax, arrowstyle='->', arrowsize=20, alpha=0.7)
         
         # 绘制节点
-        nx.draw_networkx_nodes(G, pos, node_size=node_size, node_color='#3498db', alpha=0.8)
+        nx.draw_networkx_nodes(G, pos, ax=ax, node_size=node_size, node_color='#3498db', alpha=0.8)
         
         # 绘制标签
-        nx.draw_networkx_labels(G, pos, font_size=font_size, font_weight='bold')
+        nx.draw_networkx_labels(G, pos, ax=ax, font_size=font_size, font_weight='bold')
         
-        plt.title('Concept Hierarchy Visualization')
-        plt.axis('off')
-        plt.tight_layout()
+        ax.set_title('Concept Hierarchy Visualization')
+        ax.axis('off')
         
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"概念层次结构可视化已保存至: {output_path}")
-        else:
-            plt.show()
-        
-        plt.close()
+        self._save_or_show(fig, output_path, dpi, tight, "概念层次结构可视化已保存至")
     
-    def visualize_concept_evolution(self, concept_timeline, output_path=None, figsize=(14, 8)):
+    def visualize_concept_evolution(self, concept_timeline, output_path=None, figsize=(14, 8), dpi=150, tight=False):
         """可视化概念演变"""
-        # 准备数据
-        concepts = list(concept_timeline.keys())
-        time_periods = sorted(list(set(period for concept in concept_timeline.values() for period in concept.keys())))
-        
-        # 创建时间-概念矩阵
-        matrix = np.zeros((len(concepts), len(time_periods)))
-        for i, concept in enumerate(concepts):
-            for j, period in enumerate(time_periods):
-                if period in concept_timeline[concept]:
-                    matrix[i, j] = concept_timeline[concept][period]
-        
-        # 创建自定义颜色映射
-        colors = [(0, 0, 1), (0, 1, 1), (0, 1, 0), (1, 1, 0), (1, 0, 0)]
-        cmap = LinearSegmentedColormap.from_list('evolution_cmap', colors, N=100)
+        # 准备数据，创建概念-时间矩阵，时间段按排序后的顺序排列
+        concepts, time_periods, matrix = to_matrix(concept_timeline, sort_columns=True)
         
         # 绘制热力图
-        plt.figure(figsize=figsize)
-        plt.imshow(matrix, cmap=cmap, aspect='auto', interpolation='nearest')
+        fig, ax = self._new_figure(figsize, interactive=not output_path)
+        image = ax.imshow(matrix, cmap=_EVOLUTION_CMAP, aspect='auto', interpolation='nearest')
         
         # 添加颜色条
-        plt.colorbar(label='Concept Significance')
+        fig.colorbar(image, ax=ax, label='Concept Significance')
         
         # 设置标签
-        plt.xticks(np.arange(len(time_periods)), time_periods, rotation=45, ha='right')
-        plt.yticks(np.arange(len(concepts)), concepts)
+        ax.set_xticks(np.arange(len(time_periods)))
+        ax.set_xticklabels(time_periods, rotation=45, ha='right')
+        ax.set_yticks(np.arange(len(concepts)))
+        ax.set_yticklabels(concepts)
         
-        plt.title('Concept Evolution Over Time')
-        plt.xlabel('Time Period')
-        plt.ylabel('Concept')
+        ax.set_title('Concept Evolution Over Time')
+        ax.set_xlabel('Time Period')
+        ax.set_ylabel('Concept')
         
-        plt.tight_layout()
         
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"概念演变可视化已保存至: {output_path}")
-        else:
-            plt.show()
-        
-        plt.close()
+        self._save_or_show(fig, output_path, dpi, tight, "概念演变可视化已保存至")
     
-    def visualize_concept_connections(self, concepts, connections, output_path=None, figsize=(12, 10), node_size=3000):
+    def visualize_concept_connections(self, concepts, connections, output_path=None, figsize=(12, 10), node_size=3000, layout_iterations=50, layout_backend='auto', dpi=150, tight=False):
         """可视化概念关联"""
         # 构建网络
         G = nx.Graph()
@@ -124,82 +175,64 @@ class ConceptVisualizer:
                 G.add_edge(source, target, strength=strength)
         
         # 计算布局
-        pos = nx.spring_layout(G, k=0.3, iterations=200)
+        pos = self._compute_layout(G, layout_iterations, layout_backend)
         
         # 准备节点大小和颜色
-        node_sizes = [G.nodes[node]['importance'] * node_size for node in G.nodes]
-        node_colors = list(range(len(G.nodes)))
+        n_nodes = G.number_of_nodes()
+        importance = np.fromiter((value for _, value in G.nodes(data='importance')), dtype=np.float64, count=n_nodes)
+        node_sizes = importance * node_size
+        node_colors = np.arange(n_nodes)
         
         # 准备边的宽度
-        edge_widths = [edge[2]['strength'] * 2 for edge in G.edges(data=True)]
+        strength = np.fromiter((value for _, _, value in G.edges(data='strength')), dtype=np.float64, count=G.number_of_edges())
+        edge_widths = strength * 2
         
         # 绘制图形
-        plt.figure(figsize=figsize)
+        fig, ax = self._new_figure(figsize, interactive=not output_path)
         
         # 绘制边
-        nx.draw_networkx_edges(G, pos, width=edge_widths, alpha=0.7)
+        nx.draw_networkx_edges(G, pos, ax=ax, width=edge_widths, alpha=0.7)
         
         # 绘制节点
-        nx.draw_networkx_nodes(G, pos, node_size=node_sizes, node_color=node_colors, cmap=plt.cm.viridis, alpha=0.8)
+        nx.draw_networkx_nodes(G, pos, ax=ax, node_size=node_sizes, node_color=node_colors, cmap=plt.cm.viridis, alpha=0.8)
         
         # 绘制标签
-        nx.draw_networkx_labels(G, pos, font_size=10, font_weight='bold')
+        nx.draw_networkx_labels(G, pos, ax=ax, font_size=10, font_weight='bold')
         
-        plt.title('Concept Connections Visualization')
-        plt.axis('off')
+        ax.set_title('Concept Connections Visualization')
+        ax.axis('off')
         
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"概念关联可视化已保存至: {output_path}")
-        else:
-            plt.show()
-        
-        plt.close()
+        self._save_or_show(fig, output_path, dpi, tight, "概念关联可视化已保存至")
     
-    def visualize_concept_comparison(self, concept_data, output_path=None, figsize=(14, 8)):
+    def visualize_concept_comparison(self, concept_data, output_path=None, figsize=(14, 8), dpi=150, tight=False):
         """可视化不同哲学流派的概念对比"""
-        # 准备数据
-        concepts = list(concept_data.keys())
-        schools = list(set(school for concept_values in concept_data.values() for school in concept_values.keys()))
-        
-        # 创建数据矩阵
+        # 准备数据，创建概念-流派矩阵
+        concepts, schools, matrix = to_matrix(concept_data)
         n_concepts = len(concepts)
         n_schools = len(schools)
-        matrix = np.zeros((n_concepts, n_schools))
-        
-        for i, concept in enumerate(concepts):
-            for j, school in enumerate(schools):
-                if school in concept_data[concept]:
-                    matrix[i, j] = concept_data[concept][school]
         
         # 绘制分组条形图
-        plt.figure(figsize=figsize)
+        fig, ax = self._new_figure(figsize, interactive=not output_path)
         
         bar_width = 0.8 / n_schools
         indices = np.arange(n_concepts)
         
-        colors = plt.cm.Set3(np.linspace(0, 1, n_schools))
+        colors = _set3_colors(n_schools)
         
         for i, (school, color) in enumerate(zip(schools, colors)):
             offset = (i - n_schools/2 + 0.5) * bar_width
-            plt.bar(indices + offset, matrix[:, i], bar_width, label=school, color=color, alpha=0.7)
-        
-        plt.xlabel('Concepts')
-        plt.ylabel('Significance')
-        plt.title('Concept Comparison Across Philosophical Schools')
-        plt.xticks(indices, concepts, rotation=45, ha='right')
-        plt.legend()
-        plt.tight_layout()
+            ax.bar(indices + offset, matrix[:, i], bar_width, label=school, color=color, alpha=0.7)
         
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"概念对比可视化已保存至: {output_path}")
-        else:
-            plt.show()
+        ax.set_xlabel('Concepts')
+        ax.set_ylabel('Significance')
+        ax.set_title('Concept Comparison Across Philosophical Schools')
+        ax.set_xticks(indices)
+        ax.set_xticklabels(concepts, rotation=45, ha='right')
+        ax.legend()
         
-        plt.close()
+        self._save_or_show(fig, output_path, dpi, tight, "概念对比可视化已保存至")
     
-    def visualize_concept_cloud(self, concepts, output_path=None, figsize=(12, 10)):
+    def visualize_concept_cloud(self, concepts, output_path=None, figsize=(12, 10), dpi=150, tight=False):
         """可视化概念云"""
         try:
             from wordcloud import WordCloud
@@ -207,26 +240,25 @@ class ConceptVisualizer:
             # 准备词频数据
             word_freq = {concept: weight for concept, weight in concepts.items()}
             
-            # 创建词云
-            wordcloud = WordCloud(width=1200, height=1000, background_color='white', 
-                                 colormap='viridis', max_font_size=200, 
-                                 min_font_size=20, prefer_horizontal=0.8)
+            # 创建词云；输出图像的像素数不足1200x1000时按比例缩小画布和字号，避免生成过大的位图再缩小显示
+            # 同一尺寸的WordCloud实例在多次调用间复用
+            scale = min(1.0, figsize[0] * dpi / 1200, figsize[1] * dpi / 1000)
+            wordcloud = self._wordclouds.get(scale)
+            if wordcloud is None:
+                wordcloud = WordCloud(width=int(1200 * scale), height=int(1000 * scale), background_color='white', 
+                                      colormap='viridis', max_font_size=int(200 * scale), 
+                                      min_font_size=max(4, int(20 * scale)), prefer_horizontal=0.8)
+                self._wordclouds[scale] = wordcloud
             
             wordcloud.generate_from_frequencies(word_freq)
             
             # 绘制词云
-            plt.figure(figsize=figsize)
-            plt.imshow(wordcloud, interpolation='bilinear')
-            plt.axis('off')
-            plt.title('Concept Cloud Visualization')
-            
-            if output_path:
-                plt.savefig(output_path, dpi=300, bbox_inches='tight')
-                print(f"概念云可视化已保存至: {output_path}")
-            else:
-                plt.show()
+            fig, ax = self._new_figure(figsize, interactive=not output_path)
+            ax.imshow(wordcloud, interpolation='bilinear')
+            ax.axis('off')
+            ax.set_title('Concept Cloud Visualization')
             
-            plt.close()
+            self._save_or_show(fig, output_path, dpi, tight, "概念云可视化已保存至")
         except ImportError:
             print("需要安装wordcloud库来生成概念云: pip install wordcloud")
 
@@ -1,160 +1,175 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
 from collections import defaultdict
-from scipy import stats
+from itertools import combinations
+from scipy.spatial.distance import pdist, squareform
+
+# 公共工具模块位于上级scripts目录；加入搜索路径后，直接运行本脚本与作为scripts包的子模块导入都能找到它
+_SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
+
+from analysis_utils import save_figure, to_matrix
+
+# 评分通常是0-5的小整数，float32的精度足够，内存和BLAS运算量减半
+_MATRIX_DTYPE = np.float32
+
+
+def _row_correlations(matrix):
+    """计算所有行向量两两之间的皮尔逊相关系数，结果与np.corrcoef一致，以float64返回"""
+    # 先把每行中心化并归一化为单位向量，一次矩阵乘法即得全部相关系数，省去对n×n结果的两次整体除法
+    centered = matrix - matrix.mean(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 取值全部相同的行范数为0，相关系数与np.corrcoef相同为nan
+        centered /= np.sqrt(np.einsum('ij,ij->i', centered, centered))[:, None]
+    correlations = (centered @ centered.T).astype(np.float64)
+    np.clip(correlations, -1, 1, out=correlations)
+    # 单精度下对角线会偏离1（如0.99999994），与pearsonr一样将其置为1，取值全部相同的行保留nan
+    diagonal = np.diagonal(correlations)
+    np.fill_diagonal(correlations, np.where(np.isnan(diagonal), np.nan, 1.0))
+    return correlations
+
+
+def _save_or_show(fig, output_path, dpi, tight, message):
+    """有输出路径时保存图表，否则交互显示，最后释放画布"""
+    if output_path:
+        save_figure(fig, output_path, dpi, tight)
+        print(f"{message}: {output_path}")
+    else:
+        fig.tight_layout()
+        plt.show()
+    
+    plt.close(fig)
+
+
+def _annotated_heatmap(ax, matrix, xticklabels, yticklabels, cmap, vmin=None, vmax=None, cbar_label=None, max_cells=400):
+    """用imshow绘制热力图；单元格不多时标注数值，文字颜色按单元格亮度取黑或白"""
+    image = ax.imshow(matrix, cmap=cmap, vmin=vmin, vmax=vmax, aspect='auto', interpolation='nearest')
+    ax.figure.colorbar(image, ax=ax, label=cbar_label)
+    
+    ax.set_xticks(np.arange(len(xticklabels)))
+    ax.set_xticklabels(xticklabels, rotation=45, ha='right')
+    ax.set_yticks(np.arange(len(yticklabels)))
+    ax.set_yticklabels(yticklabels)
+    
+    if matrix.size <= max_cells:
+        # 按WCAG相对亮度公式一次性计算所有单元格颜色的亮度
+        rgb = image.cmap(image.norm(matrix))[..., :3]
+        rgb = np.where(rgb <= 0.03928, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+        dark = rgb @ np.array([0.2126, 0.7152, 0.0722]) <= 0.408
+        for (i, j), value in np.ndenumerate(matrix):
+            ax.text(j, i, f"{value:.2g}", ha='center', va='center', color='w' if dark[i, j] else '.15')
+    return image
+
 
 class CrossCulturalAnalyzer:
+    # 热力图标注数值的最大单元格数
+    ANNOTATION_MAX_CELLS = 400
+    
     def __init__(self):
         pass
     
-    def compare_concepts_across_cultures(self, concept_data, output_path=None, figsize=(14, 8)):
+    def compare_concepts_across_cultures(self, concept_data, output_path=None, figsize=(14, 8), dpi=150, tight=False):
         """比较不同文化中的概念"""
-        # 准备数据
-        cultures = list(concept_data.keys())
-        concepts = list(set(concept for culture in concept_data.values() for concept in culture.keys()))
+        # 准备数据，创建概念-文化矩阵
+        # 某文化未涉及的概念记为NaN，统计时只计入实际出现的取值，不把缺失当作0
+        cultures, concepts, matrix = to_matrix(concept_data, missing=np.nan, dtype=_MATRIX_DTYPE)
+        matrix = matrix.T
         
-        # 创建概念-文化矩阵
-        n_concepts = len(concepts)
-        n_cultures = len(cultures)
-        matrix = np.zeros((n_concepts, n_cultures))
+        # 分析概念在不同文化中的重要性（按行一次性计算所有概念的统计量）
+        mean_importance = np.nanmean(matrix, axis=1)
+        std_importance = np.nanstd(matrix, axis=1)
+        variance = np.nanvar(matrix, axis=1)
         
-        for i, concept in enumerate(concepts):
-            for j, culture in enumerate(cultures):
-                if concept in concept_data[culture]:
-                    matrix[i, j] = concept_data[culture][concept]
+        # 返回的取值列表和热力图中缺失值仍显示为0
+        matrix = np.nan_to_num(matrix)
         
-        # 分析概念在不同文化中的重要性
         concept_analysis = {}
-        for i, concept in enumerate(concepts):
-            values = matrix[i, :]
-            mean_importance = np.mean(values)
-            std_importance = np.std(values)
-            variance = np.var(values)
+        for i, (concept, values) in enumerate(zip(concepts, matrix.tolist())):
             concept_analysis[concept] = {
-                'mean_importance': mean_importance,
-                'std_importance': std_importance,
-                'variance': variance,
-                'values': values.tolist()
+                'mean_importance': mean_importance[i],
+                'std_importance': std_importance[i],
+                'variance': variance[i],
+                'values': values
             }
         
         # 绘制热力图
-        plt.figure(figsize=figsize)
-        sns.heatmap(matrix, annot=True, cmap='viridis', xticklabels=cultures, yticklabels=concepts, cbar_kws={'label': 'Importance'})
-        plt.title('Concept Importance Across Cultures')
-        plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"跨文化概念比较已保存至: {output_path}")
-        else:
-            plt.show()
+        fig, ax = plt.subplots(figsize=figsize)
+        _annotated_heatmap(ax, matrix, cultures, concepts, 'viridis', cbar_label='Importance', max_cells=self.ANNOTATION_MAX_CELLS)
+        ax.set_title('Concept Importance Across Cultures')
         
-        plt.close()
+        _save_or_show(fig, output_path, dpi, tight, "跨文化概念比较已保存至")
         
         return concept_analysis
     
-    def analyze_philosophical_similarities(self, philosophy_data, output_path=None, figsize=(12, 10)):
+    def analyze_philosophical_similarities(self, philosophy_data, output_path=None, figsize=(12, 10), dpi=150, tight=False):
         """分析不同文化哲学的相似性"""
-        # 准备数据
-        philosophies = list(philosophy_data.keys())
-        concepts = list(set(concept for phil in philosophy_data.values() for concept in phil.keys()))
-        
-        # 创建哲学-概念矩阵
-        n_philosophies = len(philosophies)
-        n_concepts = len(concepts)
-        matrix = np.zeros((n_philosophies, n_concepts))
-        
-        for i, phil in enumerate(philosophies):
-            for j, concept in enumerate(concepts):
-                if concept in philosophy_data[phil]:
-                    matrix[i, j] = philosophy_data[phil][concept]
-        
-        # 计算相似性矩阵
-        similarity_matrix = np.zeros((n_philosophies, n_philosophies))
-        for i in range(n_philosophies):
-            for j in range(n_philosophies):
-                # 计算皮尔逊相关系数
-                correlation, _ = stats.pearsonr(matrix[i, :], matrix[j, :])
-                similarity_matrix[i, j] = correlation
+        # 准备数据，创建哲学-概念矩阵
+        philosophies, concepts, matrix = to_matrix(philosophy_data, dtype=_MATRIX_DTYPE)
+        
+        # 计算相似性矩阵（一次性计算全部行向量的皮尔逊相关系数）
+        similarity_matrix = _row_correlations(matrix)
         
         # 绘制相似性热力图
-        plt.figure(figsize=figsize)
-        sns.heatmap(similarity_matrix, annot=True, cmap='coolwarm', xticklabels=philosophies, yticklabels=philosophies, vmin=-1, vmax=1)
-        plt.title('Philosophical Similarities Across Cultures')
-        plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"哲学相似性分析已保存至: {output_path}")
-        else:
-            plt.show()
+        fig, ax = plt.subplots(figsize=figsize)
+        _annotated_heatmap(ax, similarity_matrix, philosophies, philosophies, 'coolwarm', vmin=-1, vmax=1, max_cells=self.ANNOTATION_MAX_CELLS)
+        ax.set_title('Philosophical Similarities Across Cultures')
         
-        plt.close()
+        _save_or_show(fig, output_path, dpi, tight, "哲学相似性分析已保存至")
         
         return similarity_matrix
     
-    def analyze_conceptual_overlap(self, culture_data, output_path=None, figsize=(12, 8)):
+    def analyze_conceptual_overlap(self, culture_data, output_path=None, figsize=(12, 8), dpi=150, tight=False):
         """分析不同文化中概念的重叠"""
         # 准备数据
         cultures = list(culture_data.keys())
+        n_cultures = len(cultures)
         
-        # 计算概念重叠
-        overlap_analysis = {}
+        # 构建文化-概念指示矩阵，一次矩阵乘法得到所有文化对的共同概念数
+        vocabulary = list(dict.fromkeys(concept for concepts in culture_data.values() for concept in concepts))
+        concept_index = {concept: k for k, concept in enumerate(vocabulary)}
+        indicator = np.zeros((n_cultures, len(vocabulary)), dtype=np.int32)
+        for i, concepts in enumerate(culture_data.values()):
+            indicator[i, [concept_index[concept] for concept in concepts]] = 1
+        
+        intersections = indicator @ indicator.T
+        sizes = indicator.sum(axis=1)
+        
+        # 计算重叠率（共同概念数/较小概念集大小）和Jaccard相似度
+        smaller = np.minimum(sizes[:, None], sizes[None, :])
+        unions = sizes[:, None] + sizes[None, :] - intersections
+        overlap_ratios = np.divide(intersections, smaller, out=np.zeros(smaller.shape), where=smaller > 0)
+        jaccard = np.divide(intersections, unions, out=np.zeros(unions.shape), where=unions > 0)
         
         # 计算每对文化之间的概念重叠
-        for i, culture1 in enumerate(cultures):
-            for j, culture2 in enumerate(cultures):
-                if i < j:
-                    concepts1 = set(culture_data[culture1].keys())
-                    concepts2 = set(culture_data[culture2].keys())
-                    
-                    # 计算共同概念
-                    common_concepts = concepts1.intersection(concepts2)
-                    
-                    # 计算重叠率
-                    overlap_ratio = len(common_concepts) / min(len(concepts1), len(concepts2)) if min(len(concepts1), len(concepts2)) > 0 else 0
-                    
-                    # 计算Jaccard相似度
-                    jaccard_similarity = len(common_concepts) / len(concepts1.union(concepts2)) if len(concepts1.union(concepts2)) > 0 else 0
-                    
-                    overlap_analysis[(culture1, culture2)] = {
-                        'common_concepts': list(common_concepts),
-                        'overlap_ratio': overlap_ratio,
-                        'jaccard_similarity': jaccard_similarity,
-                        'count_common': len(common_concepts),
-                        'count_culture1': len(concepts1),
-                        'count_culture2': len(concepts2)
-                    }
+        overlap_analysis = {}
+        vocabulary = np.array(vocabulary, dtype=object)
+        for i, j in zip(*np.triu_indices(n_cultures, k=1)):
+            common_concepts = vocabulary[(indicator[i] & indicator[j]).astype(bool)]
+            overlap_analysis[(cultures[i], cultures[j])] = {
+                'common_concepts': common_concepts.tolist(),
+                'overlap_ratio': float(overlap_ratios[i, j]),
+                'jaccard_similarity': float(jaccard[i, j]),
+                'count_common': int(intersections[i, j]),
+                'count_culture1': int(sizes[i]),
+                'count_culture2': int(sizes[j])
+            }
         
         # 绘制概念重叠矩阵
-        n_cultures = len(cultures)
-        overlap_matrix = np.zeros((n_cultures, n_cultures))
-        
-        for i, culture1 in enumerate(cultures):
-            for j, culture2 in enumerate(cultures):
-                if i == j:
-                    overlap_matrix[i, j] = 1.0
-                elif i < j:
-                    overlap_matrix[i, j] = overlap_analysis[(culture1, culture2)]['jaccard_similarity']
-                    overlap_matrix[j, i] = overlap_analysis[(culture1, culture2)]['jaccard_similarity']
-        
-        plt.figure(figsize=figsize)
-        sns.heatmap(overlap_matrix, annot=True, cmap='viridis', xticklabels=cultures, yticklabels=cultures, vmin=0, vmax=1, cbar_kws={'label': 'Jaccard Similarity'})
-        plt.title('Conceptual Overlap Across Cultures')
-        plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"概念重叠分析已保存至: {output_path}")
-        else:
-            plt.show()
+        overlap_matrix = jaccard
+        np.fill_diagonal(overlap_matrix, 1.0)
+        
+        fig, ax = plt.subplots(figsize=figsize)
+        _annotated_heatmap(ax, overlap_matrix, cultures, cultures, 'viridis', vmin=0, vmax=1, cbar_label='Jaccard Similarity', max_cells=self.ANNOTATION_MAX_CELLS)
+        ax.set_title('Conceptual Overlap Across Cultures')
         
-        plt.close()
+        _save_or_show(fig, output_path, dpi, tight, "概念重叠分析已保存至")
         
         return overlap_analysis
     
-    def visualize_cultural_comparison(self, comparison_data, output_path=None, figsize=(14, 8)):
+    def visualize_cultural_comparison(self, comparison_data, output_path=None, figsize=(14, 8), dpi=150, tight=False):
         """可视化文化比较"""
         # 准备数据
         categories = list(comparison_data.keys())
@@ -163,14 +178,14 @@ class CrossCulturalAnalyzer:
         # 创建数据矩阵
         n_categories = len(categories)
         n_cultures = len(cultures)
-        matrix = np.zeros((n_categories, n_cultures))
+        matrix = np.zeros((n_categories, n_cultures), dtype=_MATRIX_DTYPE)
         
         for i, category in enumerate(categories):
             for j, culture in enumerate(cultures):
                 matrix[i, j] = comparison_data[category][culture]
         
         # 绘制分组条形图
-        plt.figure(figsize=figsize)
+        fig, ax = plt.subplots(figsize=figsize)
         
         bar_width = 0.8 / n_cultures
         indices = np.arange(n_categories)
@@ -179,104 +194,80 @@ class CrossCulturalAnalyzer:
         
         for i, (culture, color) in enumerate(zip(cultures, colors)):
             offset = (i - n_cultures/2 + 0.5) * bar_width
-            plt.bar(indices + offset, matrix[:, i], bar_width, label=culture, color=color, alpha=0.7)
-        
-        plt.title('Cultural Comparison')
-        plt.xlabel('Category')
-        plt.ylabel('Value')
-        plt.xticks(indices, categories, rotation=45, ha='right')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"文化比较可视化已保存至: {output_path}")
-        else:
-            plt.show()
+            ax.bar(indices + offset, matrix[:, i], bar_width, label=culture, color=color, alpha=0.7)
         
-        plt.close()
+        ax.set_title('Cultural Comparison')
+        ax.set_xlabel('Category')
+        ax.set_ylabel('Value')
+        ax.set_xticks(indices)
+        ax.set_xticklabels(categories, rotation=45, ha='right')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        
+        _save_or_show(fig, output_path, dpi, tight, "文化比较可视化已保存至")
     
-    def analyze_philosophical_themes(self, theme_data, output_path=None, figsize=(14, 10)):
+    def analyze_philosophical_themes(self, theme_data, output_path=None, figsize=(14, 10), dpi=150, tight=False):
         """分析不同文化中的哲学主题"""
-        # 准备数据
-        themes = list(theme_data.keys())
-        cultures = list(set(culture for theme in theme_data.values() for culture in theme.keys()))
-        
-        # 创建主题-文化矩阵
-        n_themes = len(themes)
-        n_cultures = len(cultures)
-        matrix = np.zeros((n_themes, n_cultures))
-        
-        for i, theme in enumerate(themes):
-            for j, culture in enumerate(cultures):
-                if culture in theme_data[theme]:
-                    matrix[i, j] = theme_data[theme][culture]
+        # 准备数据，创建主题-文化矩阵
+        themes, cultures, matrix = to_matrix(theme_data, dtype=_MATRIX_DTYPE)
         
         # 分析主题在不同文化中的分布
+        max_values = matrix.max(axis=1)
+        dominant_indices = matrix.argmax(axis=1)
+        
         theme_analysis = {}
-        for i, theme in enumerate(themes):
-            values = matrix[i, :]
-            dominant_culture = cultures[np.argmax(values)] if np.max(values) > 0 else None
+        for i, (theme, values) in enumerate(zip(themes, matrix.tolist())):
+            dominant_culture = cultures[dominant_indices[i]] if max_values[i] > 0 else None
             theme_analysis[theme] = {
                 'dominant_culture': dominant_culture,
-                'values': values.tolist()
+                'values': values
             }
         
         # 绘制热力图
-        plt.figure(figsize=figsize)
-        sns.heatmap(matrix, annot=True, cmap='viridis', xticklabels=cultures, yticklabels=themes, cbar_kws={'label': 'Significance'})
-        plt.title('Philosophical Themes Across Cultures')
-        plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"哲学主题分析已保存至: {output_path}")
-        else:
-            plt.show()
+        fig, ax = plt.subplots(figsize=figsize)
+        _annotated_heatmap(ax, matrix, cultures, themes, 'viridis', cbar_label='Significance', max_cells=self.ANNOTATION_MAX_CELLS)
+        ax.set_title('Philosophical Themes Across Cultures')
         
-        plt.close()
+        _save_or_show(fig, output_path, dpi, tight, "哲学主题分析已保存至")
         
         return theme_analysis
     
-    def generate_cultural_distance_map(self, culture_data, output_path=None, figsize=(12, 10)):
+    def generate_cultural_distance_map(self, culture_data, output_path=None, figsize=(12, 10), dpi=150, condensed=False, tight=False):
         """生成文化距离地图"""
         # 准备数据
         cultures = list(culture_data.keys())
         
-        # 计算文化距离矩阵
+        # 计算文化距离，按pdist的压缩形式只保存上三角
         n_cultures = len(cultures)
-        distance_matrix = np.zeros((n_cultures, n_cultures))
-        
-        for i in range(n_cultures):
-            for j in range(n_cultures):
-                if i != j:
-                    # 计算欧氏距离
-                    values1 = list(culture_data[cultures[i]].values())
-                    values2 = list(culture_data[cultures[j]].values())
-                    
-                    # 确保维度一致
-                    min_len = min(len(values1), len(values2))
-                    values1 = values1[:min_len]
-                    values2 = values2[:min_len]
-                    
-                    distance = np.linalg.norm(np.array(values1) - np.array(values2))
-                    distance_matrix[i, j] = distance
+        value_lists = [list(values.values()) for values in culture_data.values()]
         
-        # 绘制距离热力图
-        plt.figure(figsize=figsize)
-        sns.heatmap(distance_matrix, annot=True, cmap='coolwarm', xticklabels=cultures, yticklabels=cultures, cbar_kws={'label': 'Distance'})
-        plt.title('Cultural Distance Map')
-        plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"文化距离地图已保存至: {output_path}")
+        if n_cultures < 2:
+            distances = np.zeros(0)
+        elif len({len(values) for values in value_lists}) == 1:
+            # 各文化取值个数相同时一次性计算所有两两欧氏距离
+            distances = pdist(np.array(value_lists, dtype=np.float64), metric='euclidean')
         else:
-            plt.show()
+            # 取值个数不同时，每对文化只比较共同长度的前缀
+            def prefix_distance(i, j):
+                min_len = min(len(value_lists[i]), len(value_lists[j]))
+                return np.linalg.norm(np.subtract(value_lists[i][:min_len], value_lists[j][:min_len]))
+            
+            pairs = combinations(range(n_cultures), 2)
+            distances = np.fromiter((prefix_distance(i, j) for i, j in pairs), dtype=np.float64, count=n_cultures * (n_cultures - 1) // 2)
+        
+        # 只在绘图时展开为完整的距离矩阵
+        distance_matrix = squareform(distances) if n_cultures >= 2 else np.zeros((n_cultures, n_cultures))
+        
+        # 绘制距离热力图
+        fig, ax = plt.subplots(figsize=figsize)
+        _annotated_heatmap(ax, distance_matrix, cultures, cultures, 'coolwarm', cbar_label='Distance', max_cells=self.ANNOTATION_MAX_CELLS)
+        ax.set_title('Cultural Distance Map')
         
-        plt.close()
+        _save_or_show(fig, output_path, dpi, tight, "文化距离地图已保存至")
         
+        # condensed=True时只返回上三角部分，可用squareform还原
+        if condensed:
+            return distances
         return distance_matrix
 
 if __name__ == "__main__":
@@ -1,23 +1,168 @@
+import inspect
+import math
+import os
+import sys
 import networkx as nx
 import matplotlib.pyplot as plt
 import numpy as np
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+from scipy.sparse import csr_matrix
 import json
 
+# 公共工具模块位于上级scripts目录；加入搜索路径后，直接运行本脚本与作为scripts包的子模块导入都能找到它
+_SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
+
+from analysis_utils import symmetric_adjacency
+
+try:
+    import rustworkx
+except ImportError:
+    rustworkx = None
+
+try:
+    import igraph
+except ImportError:
+    igraph = None
+
+try:
+    from fa2 import ForceAtlas2
+except ImportError:
+    ForceAtlas2 = None
+
+try:
+    import networkit
+except ImportError:
+    networkit = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# networkx 2.8起greedy_modularity_communities才支持cutoff/best_n，旧版本只有按模块度提前停止的n_communities
+_GREEDY_SUPPORTS_BEST_N = 'best_n' in inspect.signature(nx.community.greedy_modularity_communities).parameters
+
+
+def _merge_communities(graph, communities, n_communities):
+    """把模块度增益最大的一对相连社区依次合并，直到不多于n_communities个或没有相连的社区对，按规模从大到小返回"""
+    communities = [set(community) for community in communities]
+    total_weight = graph.size(weight='weight')
+    if total_weight == 0:
+        return communities
+    
+    # a[i]为社区i的加权度数占总度数的比例，between[i, j]为社区i与j之间的边权重之和
+    membership = {node: i for i, community in enumerate(communities) for node in community}
+    a = [sum(degree for _, degree in graph.degree(community, weight='weight')) / (2 * total_weight) for community in communities]
+    between = defaultdict(float)
+    for u, v, weight in graph.edges(data='weight', default=1.0):
+        i, j = sorted((membership[u], membership[v]))
+        if i != j:
+            between[i, j] += weight
+    
+    n_remaining = len(communities)
+    while n_remaining > n_communities and between:
+        # 合并i与j的模块度增益为e_ij/m - 2*a_i*a_j
+        i, j = max(between, key=lambda pair: between[pair] / total_weight - 2 * a[pair[0]] * a[pair[1]])
+        communities[i] |= communities[j]
+        communities[j] = None
+        a[i] += a[j]
+        # 与j相连的边权重转记到i上
+        for pair in [pair for pair in between if j in pair]:
+            weight = between.pop(pair)
+            other = pair[0] if pair[1] == j else pair[1]
+            if other != i:
+                between[min(i, other), max(i, other)] += weight
+        n_remaining -= 1
+    
+    return sorted((community for community in communities if community is not None), key=len, reverse=True)
+
+
+def _betweenness_centrality(graph, sample_size=None):
+    """计算介数中心性，指定sample_size时抽样部分源节点近似计算"""
+    if sample_size is None:
+        return nx.betweenness_centrality(graph)
+    return nx.betweenness_centrality(graph, k=sample_size, seed=0)
+
+
+def _eigenvector_centrality(graph, max_iter=1000, tol=1e-06):
+    """在稀疏邻接矩阵上做幂迭代计算特征向量中心性，迭代方式与nx.eigenvector_centrality一致，不收敛时返回空字典"""
+    n_nodes = len(graph)
+    if n_nodes == 0:
+        return {}
+    
+    # 0/1邻接矩阵，adjacency[u, v]=1表示存在边u->v
+    node_index = {node: i for i, node in enumerate(graph.nodes)}
+    pairs = np.array([(node_index[u], node_index[v]) for u, v in graph.edges], dtype=np.int64).reshape(-1, 2)
+    adjacency = csr_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n_nodes, n_nodes))
+    transposed = adjacency.T.tocsr()
+    
+    # 与NetworkX相同，用(A+I)迭代以保证收敛，每轮按L2范数归一化
+    x = np.full(n_nodes, 1.0 / n_nodes)
+    for _ in range(max_iter):
+        x_last = x
+        x = x_last + transposed @ x_last
+        norm = np.linalg.norm(x) or 1
+        x = x / norm
+        if np.abs(x - x_last).sum() < n_nodes * tol:
+            return dict(zip(graph.nodes, x.tolist()))
+    return {}
+
+
+def _transitivity(undirected):
+    """用稀疏邻接矩阵乘法计算传递性，结果与nx.transitivity一致"""
+    # 构建去掉自环的0/1对称邻接矩阵
+    node_index = {node: i for i, node in enumerate(undirected.nodes)}
+    pairs = np.array([(node_index[u], node_index[v]) for u, v in undirected.edges if u != v], dtype=np.int64).reshape(-1, 2)
+    rows = np.concatenate([pairs[:, 0], pairs[:, 1]])
+    cols = np.concatenate([pairs[:, 1], pairs[:, 0]])
+    adjacency = csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=(len(node_index), len(node_index)))
+    
+    # trace(A^3)为三角形数的6倍，sum(d(d-1))为连通三元组数的2倍，二者之比即传递性
+    triangles = int(adjacency.multiply(adjacency @ adjacency).sum())
+    degrees = np.asarray(adjacency.sum(axis=1)).ravel()
+    triads = int((degrees * (degrees - 1)).sum())
+    return 0 if triangles == 0 else triangles / triads
+
+
 class InfluenceNetworkAnalyzer:
+    # 综合排名中各中心性指标的权重
+    CENTRALITY_WEIGHTS = (
+        ('degree_centrality', 0.2),
+        ('in_degree_centrality', 0.3),
+        ('out_degree_centrality', 0.2),
+        ('betweenness_centrality', 0.2),
+        ('eigenvector_centrality', 0.1)
+    )
+    # 节点数不少于该值时，介数与特征向量中心性在子进程中并行计算
+    PARALLEL_CENTRALITY_MIN_NODES = 200
+    # networkit近似介数中心性的绝对误差上界
+    APPROX_BETWEENNESS_EPSILON = 0.05
+    # 最多缓存的网络布局数量
+    LAYOUT_CACHE_SIZE = 8
+    # 节点数超过该值且安装了fa2时，用Barnes-Hut近似的ForceAtlas2代替spring_layout
+    FA2_MIN_NODES = 200
+    
     def __init__(self):
         self.network = nx.DiGraph()
+        # 按节点和边集合缓存的网络布局
+        self._layout_cache = {}
     
     def build_influence_network(self, influencers, relationships):
         """构建影响网络"""
-        # 添加影响者节点
-        for influencer, attributes in influencers.items():
-            self.network.add_node(influencer, **attributes)
+        # 批量添加影响者节点
+        self.network.add_nodes_from(influencers.items())
         
-        # 添加影响关系边
-        for source, target, weight, relation in relationships:
-            if source in self.network.nodes and target in self.network.nodes:
-                self.network.add_edge(source, target, weight=weight, relation=relation)
+        # 批量添加两端节点都存在的影响关系边
+        nodes = self.network.nodes
+        self.network.add_edges_from(
+            (source, target, {'weight': weight, 'relation': relation})
+            for source, target, weight, relation in relationships
+            if source in nodes and target in nodes
+        )
         
         return self.network
     
@@ -27,26 +172,31 @@ class InfluenceNetworkAnalyzer:
         # 这里是一个示例实现，实际应用中可能需要更复杂的NLP技术
         
         # 假设text_data是一个字典，键是哲学家，值是包含他们思想和影响的文本
-        for philosopher, text in text_data.items():
-            self.network.add_node(philosopher)
+        philosophers = list(text_data.keys())
+        self.network.add_nodes_from(philosophers)
+        
+        # 每篇文本只分词一次，构建哲学家-词语的二值稀疏矩阵
+        vocabulary = {}
+        indptr, indices = [0], []
+        for text in text_data.values():
+            indices.extend(vocabulary.setdefault(word, len(vocabulary)) for word in set(text.lower().split()))
+            indptr.append(len(indices))
+        occurrence = csr_matrix((np.ones(len(indices), dtype=np.int32), indices, indptr), shape=(len(philosophers), len(vocabulary)))
+        
+        # 一次稀疏矩阵乘法得到两两之间的共同词数，再除以较小词集的大小得到共同词比例
+        common_counts = (occurrence @ occurrence.T).toarray()
+        sizes = np.diff(indptr)
+        smaller = np.minimum.outer(sizes, sizes)
+        similarity = np.divide(common_counts, smaller, out=np.zeros(common_counts.shape), where=smaller > 0)
         
         # 简单的共现分析来提取影响关系
-        philosophers = list(text_data.keys())
-        for i, phil1 in enumerate(philosophers):
-            for j, phil2 in enumerate(philosophers):
-                if i != j:
-                    # 简单的文本相似度计算（示例）
-                    text1 = text_data[phil1].lower()
-                    text2 = text_data[phil2].lower()
-                    
-                    # 计算共同词的比例
-                    words1 = set(text1.split())
-                    words2 = set(text2.split())
-                    common_words = words1.intersection(words2)
-                    similarity = len(common_words) / min(len(words1), len(words2)) if min(len(words1), len(words2)) > 0 else 0
-                    
-                    if similarity > threshold:
-                        self.network.add_edge(phil1, phil2, weight=similarity, relation="influence")
+        related = similarity > threshold
+        np.fill_diagonal(related, False)
+        rows, cols = np.nonzero(related)
+        self.network.add_edges_from(
+            (philosophers[i], philosophers[j], {'weight': float(similarity[i, j]), 'relation': "influence"})
+            for i, j in zip(rows.tolist(), cols.tolist())
+        )
         
         return self.network
     
@@ -54,12 +204,18 @@ class InfluenceNetworkAnalyzer:
         """
         分析网络属性
         """
+        # 聚类系数和传递性共用同一个无向视图，避免两次复制整个网络
+        undirected = self.network.to_undirected(as_view=True)
+        
+        # 密度直接由节点数和边数按公式计算，不再让nx.density重新统计
+        n_nodes = self.network.number_of_nodes()
+        n_edges = self.network.number_of_edges()
         properties = {
-            'nodes': len(self.network.nodes),
-            'edges': len(self.network.edges),
-            'density': nx.density(self.network),
-            'average_clustering': nx.average_clustering(self.network.to_undirected()),
-            'transitivity': nx.transitivity(self.network.to_undirected())
+            'nodes': n_nodes,
+            'edges': n_edges,
+            'density': n_edges / (n_nodes * (n_nodes - 1)) if n_nodes > 1 else 0,
+            'average_clustering': nx.average_clustering(undirected),
+            'transitivity': _transitivity(undirected)
         }
         
         try:
@@ -71,45 +227,90 @@ class InfluenceNetworkAnalyzer:
         
         return properties
     
-    def identify_key_influencers(self, top_n=10):
+    def _rustworkx_betweenness(self):
+        """把网络转换为rustworkx图并行计算介数中心性，结果与nx.betweenness_centrality一致"""
+        # 转换后每个节点的数据即原NetworkX节点名
+        graph = rustworkx.networkx_converter(self.network)
+        betweenness = rustworkx.digraph_betweenness_centrality(graph, normalized=True, endpoints=False, parallel_threshold=50)
+        return {graph[index]: value for index, value in betweenness.items()}
+    
+    def _networkit_betweenness(self):
+        """用networkit的多线程近似算法计算介数中心性，误差上界为APPROX_BETWEENNESS_EPSILON"""
+        # nx2nk按self.network的节点顺序把节点映射为0..N-1
+        graph = networkit.nxadapter.nx2nk(self.network)
+        approximation = networkit.centrality.ApproxBetweenness(graph, epsilon=self.APPROX_BETWEENNESS_EPSILON)
+        approximation.run()
+        return dict(zip(self.network.nodes, approximation.scores()))
+    
+    def _degree_centralities(self):
+        """计算度、入度和出度中心性"""
+        return {
+            'degree_centrality': nx.degree_centrality(self.network),
+            'in_degree_centrality': nx.in_degree_centrality(self.network),
+            'out_degree_centrality': nx.out_degree_centrality(self.network)
+        }
+    
+    def identify_key_influencers(self, top_n=10, betweenness_k=None):
         """
         识别关键影响者
+        
+        默认精确计算介数中心性；指定betweenness_k时改为抽样betweenness_k个源节点近似计算，
+        安装了networkit时则用其近似算法代替抽样
         """
-        # 计算各种中心性
+        nodes = list(self.network.nodes)
+        n_nodes = len(nodes)
+        
+        # 精确介数中心性是O(VE)的，调用方可通过betweenness_k选择抽样近似
+        sample_size = None if betweenness_k is None else min(n_nodes, betweenness_k)
+        
+        # 精确计算且安装了rustworkx时用其多线程实现；近似计算且安装了networkit时用其近似算法代替抽样；
+        # 否则在多核机器上的大型网络中，把介数和特征向量中心性这两项耗时计算放到子进程中并行执行
+        degree_centralities = None
+        if rustworkx is not None and sample_size is None:
+            betweenness = self._rustworkx_betweenness()
+            eigenvector = _eigenvector_centrality(self.network)
+        elif networkit is not None and sample_size is not None:
+            betweenness = self._networkit_betweenness()
+            eigenvector = _eigenvector_centrality(self.network)
+        elif n_nodes >= self.PARALLEL_CENTRALITY_MIN_NODES and (os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                betweenness_future = executor.submit(_betweenness_centrality, self.network, sample_size)
+                eigenvector_future = executor.submit(_eigenvector_centrality, self.network)
+                # 子进程计算期间，主进程同时计算三项度中心性
+                degree_centralities = self._degree_centralities()
+                betweenness = betweenness_future.result()
+                eigenvector = eigenvector_future.result()
+        else:
+            betweenness = _betweenness_centrality(self.network, sample_size)
+            eigenvector = _eigenvector_centrality(self.network)
+        
+        if degree_centralities is None:
+            degree_centralities = self._degree_centralities()
+        
+        # 汇总各种中心性
         centrality = {
-            'degree_centrality': nx.degree_centrality(self.network),
-            'in_degree_centrality': nx.in_degree_centrality(self.network),
-            'out_degree_centrality': nx.out_degree_centrality(self.network),
-            'betweenness_centrality': nx.betweenness_centrality(self.network),
-            'eigenvector_centrality': {}
+            **degree_centralities,
+            'betweenness_centrality': betweenness,
+            'eigenvector_centrality': eigenvector
         }
         
-        # 尝试计算特征向量中心性，处理非强连通图的情况
-        try:
-            if len(self.network) > 0:
-                centrality['eigenvector_centrality'] = nx.eigenvector_centrality(self.network, max_iter=1000, tol=1e-06)
-        except nx.NetworkXError:
-            # 如果图不是强连通的，使用近似方法
-            pass
+        # 综合排名：按节点顺序把各中心性转成数组后加权累加；
+        # 未能计算的中心性（如不收敛的特征向量中心性）为空字典，直接跳过
+        scores = np.zeros(n_nodes)
+        for name, weight in self.CENTRALITY_WEIGHTS:
+            values = centrality[name]
+            if not values:
+                continue
+            scores += np.fromiter(map(values.get, nodes, repeat(0.0)), dtype=np.float64, count=n_nodes) * weight
         
-        # 综合排名
-        key_influencers = {}
-        for node in self.network.nodes:
-            score = 0
-            if node in centrality['degree_centrality']:
-                score += centrality['degree_centrality'][node] * 0.2
-            if node in centrality['in_degree_centrality']:
-                score += centrality['in_degree_centrality'][node] * 0.3
-            if node in centrality['out_degree_centrality']:
-                score += centrality['out_degree_centrality'][node] * 0.2
-            if node in centrality['betweenness_centrality']:
-                score += centrality['betweenness_centrality'][node] * 0.2
-            if node in centrality['eigenvector_centrality']:
-                score += centrality['eigenvector_centrality'][node] * 0.1
-            key_influencers[node] = score
-        
-        # 排序并返回前N个
-        sorted_influencers = sorted(key_influencers.items(), key=lambda x: x[1], reverse=True)[:top_n]
+        # 排序并返回前N个：先用O(N)的partition找出第N大的分数，只对不低于它的候选节点排序；
+        # 稳定排序保证同分节点仍按原顺序排列
+        candidates = np.arange(n_nodes)
+        if 0 < top_n < n_nodes:
+            kth_score = np.partition(scores, n_nodes - top_n)[n_nodes - top_n]
+            candidates = np.flatnonzero(scores >= kth_score)
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')][:top_n]
+        sorted_influencers = [(nodes[i], float(scores[i])) for i in ranked.tolist()]
         
         return {
             'centrality': centrality,
@@ -117,25 +318,24 @@ class InfluenceNetworkAnalyzer:
         }
     
     def analyze_influence_paths(self, source, target, max_paths=5):
-        """分析影响路径"""
+        """
+        分析影响路径
+        
+        返回边权重乘积最大的max_paths条简单路径，按权重从大到小排列。
+        路径按权重而不是跳数挑选：跳数多但权重高的路径会排在跳数少的路径之前，
+        例如A->B权重为0.1、A->C->D->B各边权重为0.9时，max_paths=1返回的是A->C->D->B
+        """
         try:
-            # 查找所有简单路径
-            all_paths = list(nx.all_simple_paths(self.network, source=source, target=target))
-            
-            # 按路径长度排序
-            all_paths.sort(key=len)
+            # 以-log(权重)为边长，最短路径即权重乘积最大的路径；
+            # 用Yen算法按长度依次生成简单路径，只取前N条，不再枚举全部简单路径。
+            # 每条边的代价只在开始时计算一次：权重不超过1时代价非负，权重大于1的边代价记为0，保证Dijkstra可用
+            edge_weights = {(u, v): weight for u, v, weight in self.network.edges(data='weight', default=1.0)}
+            edge_costs = {edge: max(0.0, -math.log(max(weight, 1e-12))) for edge, weight in edge_weights.items()}
             
-            # 选择前N个最短路径
-            shortest_paths = all_paths[:max_paths]
+            shortest_paths = islice(nx.shortest_simple_paths(self.network, source, target, weight=lambda u, v, data: edge_costs[u, v]), max_paths)
             
-            # 计算路径权重
-            path_weights = []
-            for path in shortest_paths:
-                weight = 1.0
-                for i in range(len(path)-1):
-                    edge_weight = self.network[path[i]][path[i+1]].get('weight', 1.0)
-                    weight *= edge_weight
-                path_weights.append((path, weight))
+            # 逐条消费路径生成器，用预先取出的边权重计算路径权重，不预先物化路径列表
+            path_weights = [(path, math.prod(edge_weights[edge] for edge in zip(path, path[1:]))) for path in shortest_paths]
             
             # 按权重排序
             path_weights.sort(key=lambda x: x[1], reverse=True)
@@ -147,11 +347,36 @@ class InfluenceNetworkAnalyzer:
             print(f"分析影响路径时出错: {e}")
             return []
     
-    def analyze_influence_communities(self):
-        """分析影响社区"""
+    def _igraph_communities(self):
+        """用igraph的多层次(Louvain)算法按边权重检测社区，按社区规模从大到小返回节点集合"""
+        undirected = self.network.to_undirected(as_view=True)
+        nodes = list(undirected.nodes)
+        node_index = {node: i for i, node in enumerate(nodes)}
+        edges = list(undirected.edges(data='weight', default=1.0))
+        graph = igraph.Graph(n=len(nodes), edges=[(node_index[u], node_index[v]) for u, v, _ in edges], directed=False)
+        partition = graph.community_multilevel(weights=[weight for _, _, weight in edges])
+        communities = [{nodes[i] for i in members} for members in partition]
+        return sorted(communities, key=len, reverse=True)
+    
+    def analyze_influence_communities(self, n_communities=None):
+        """分析影响社区，指定n_communities时贪婪合并到不多于该社区数即停止"""
         try:
-            # 使用Louvain算法检测社区
-            communities = list(nx.community.greedy_modularity_communities(self.network.to_undirected()))
+            # 未指定社区数且安装了igraph时使用Louvain算法检测社区，否则使用按边权重的贪婪模块度最大化算法
+            if igraph is not None and n_communities is None:
+                communities = self._igraph_communities()
+            else:
+                # cutoff使合并在达到目标社区数时提前结束，best_n保证返回的划分不多于该数目；
+                # 旧版networkx没有best_n，模块度不再增加时剩余的社区由_merge_communities继续合并
+                undirected = self.network.to_undirected()
+                if n_communities is None:
+                    limits = {}
+                elif _GREEDY_SUPPORTS_BEST_N:
+                    limits = {'cutoff': n_communities, 'best_n': n_communities}
+                else:
+                    limits = {'n_communities': n_communities}
+                communities = list(nx.community.greedy_modularity_communities(undirected, weight='weight', **limits))
+                if n_communities is not None and len(communities) > n_communities:
+                    communities = _merge_communities(undirected, communities, n_communities)
             
             # 分析每个社区的特征
             community_analysis = {}
@@ -169,20 +394,46 @@ class InfluenceNetworkAnalyzer:
             print(f"分析影响社区时出错: {e}")
             return {}
     
+    def _get_drawing_arrays(self):
+        """按节点顺序和边顺序返回节点列表、节点度数组、边列表和边权重数组"""
+        # self.network可被调用方直接修改，因此每次绘制都重新扫描；O(N+E)的开销远小于布局计算
+        nodes = list(self.network.nodes)
+        degrees = np.fromiter((degree for _, degree in self.network.degree(nodes)), dtype=np.int32, count=len(nodes))
+        edges = list(self.network.edges(data='weight', default=1.0))
+        weights = np.fromiter((weight for _, _, weight in edges), dtype=np.float32, count=len(edges))
+        return nodes, degrees, [(u, v) for u, v, _ in edges], weights
+    
+    def _compute_layout(self, G, k):
+        """计算网络布局并按节点、边及边权重缓存，同一网络重复绘制时跳过布局计算"""
+        # spring_layout按边权重计算，权重变化后需要重新布局
+        key = (k, frozenset(G.nodes), frozenset(G.edges(data='weight', default=1.0)))
+        pos = self._layout_cache.get(key)
+        if pos is None:
+            if ForceAtlas2 is not None and G.number_of_nodes() > self.FA2_MIN_NODES:
+                # fa2只接受对称邻接矩阵，旧版forceatlas2_networkx_layout又依赖networkx 3.0已删除的to_scipy_sparse_matrix，
+                # 因此按无向边自行构建稀疏邻接矩阵，再按节点顺序取回坐标
+                positions = ForceAtlas2(scalingRatio=2.0, gravity=1.0, barnesHutOptimize=True, verbose=False).forceatlas2(symmetric_adjacency(G), pos=None, iterations=100)
+                pos = dict(zip(G.nodes, positions))
+            else:
+                pos = nx.spring_layout(G, k=k, iterations=200, seed=42)
+            if len(self._layout_cache) >= self.LAYOUT_CACHE_SIZE:
+                self._layout_cache.pop(next(iter(self._layout_cache)))
+            self._layout_cache[key] = pos
+        return pos
+    
     def visualize_influence_network(self, output_path=None, figsize=(16, 12), node_size=3000, font_size=10):
         """可视化影响网络"""
         plt.figure(figsize=figsize)
         
         # 计算布局
-        pos = nx.spring_layout(self.network, k=0.15, iterations=200)
+        pos = self._compute_layout(self.network, k=0.15)
         
         # 绘制节点
-        node_sizes = [nx.degree(self.network, node) * 1000 for node in self.network.nodes]
-        nx.draw_networkx_nodes(self.network, pos, node_size=node_sizes, alpha=0.7, node_color='#3498db')
+        nodes, degrees, edges, edge_weights = self._get_drawing_arrays()
+        nx.draw_networkx_nodes(self.network, pos, nodelist=nodes, node_size=degrees * 1000, alpha=0.7, node_color='#3498db')
         
         # 绘制边
-        edge_weights = [self.network[u][v].get('weight', 1.0) for u, v in self.network.edges]
-        nx.draw_networkx_edges(self.network, pos, width=[w*2 for w in edge_weights], alpha=0.5, edge_color='#7f8c8d', arrowsize=20)
+        nx.draw_networkx_edges(self.network, pos, edgelist=edges, width=edge_weights * 2, alpha=0.5, edge_color='#7f8c8d', arrowsize=20)
         
         # 绘制标签
         nx.draw_networkx_labels(self.network, pos, font_size=font_size, font_weight='bold')
@@ -200,18 +451,15 @@ class InfluenceNetworkAnalyzer:
     
     def visualize_influence_paths(self, paths, output_path=None, figsize=(14, 10)):
         """可视化影响路径"""
-        # 构建路径子图
-        path_edges = []
-        for path, _ in paths:
-            for i in range(len(path)-1):
-                path_edges.append((path[i], path[i+1]))
+        # 构建路径子图：先用集合对各路径共享的边去重，子图视图不复制网络
+        path_edges = {(path[i], path[i+1]) for path, _ in paths for i in range(len(path)-1)}
         
         subgraph = self.network.edge_subgraph(path_edges)
         
         plt.figure(figsize=figsize)
         
         # 计算布局
-        pos = nx.spring_layout(subgraph, k=0.2, iterations=200)
+        pos = self._compute_layout(subgraph, k=0.2)
         
         # 绘制节点
         nx.draw_networkx_nodes(subgraph, pos, node_size=4000, alpha=0.8, node_color='#e74c3c')
@@ -244,11 +492,17 @@ class InfluenceNetworkAnalyzer:
             elif format == 'json':
                 # 自定义JSON格式
                 network_data = {
-                    'nodes': [{'id': node, **self.network.nodes[node]} for node in self.network.nodes],
-                    'edges': [{'source': u, 'target': v, **self.network[u][v]} for u, v in self.network.edges]
+                    'nodes': [{'id': node, **attributes} for node, attributes in self.network.nodes(data=True)],
+                    'edges': [{'source': u, 'target': v, **attributes} for u, v, attributes in self.network.edges(data=True)]
                 }
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(network_data, f, ensure_ascii=False, indent=2)
+                # 安装了orjson时直接序列化为UTF-8字节写出，否则使用标准库json。
+                # 两者的输出并不逐字节相同：orjson把1e-05写作1e-5，并把NaN和无穷大写作null
+                if orjson is not None:
+                    with open(output_path, 'wb') as f:
+                        f.write(orjson.dumps(network_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+                else:
+                    with open(output_path, 'w', encoding='utf-8') as f:
+                        json.dump(network_data, f, ensure_ascii=False, indent=2)
             print(f"网络已导出至: {output_path}")
         except Exception as e:
             print(f"导出网络时出错: {e}")
@@ -262,8 +516,17 @@ class InfluenceNetworkAnalyzer:
                 self.network = nx.read_gexf(input_path)
             elif format == 'json':
                 # 自定义JSON格式
-                with open(input_path, 'r', encoding='utf-8') as f:
-                    network_data = json.load(f)
+                if orjson is not None:
+                    with open(input_path, 'rb') as f:
+                        raw = f.read()
+                    try:
+                        network_data = orjson.loads(raw)
+                    except orjson.JSONDecodeError:
+                        # 标准库json导出的文件可能含有orjson不接受的NaN/Infinity，改用标准库解析
+                        network_data = json.loads(raw)
+                else:
+                    with open(input_path, 'r', encoding='utf-8') as f:
+                        network_data = json.load(f)
                 self.network = nx.DiGraph()
                 for node in network_data['nodes']:
                     node_id = node.pop('id')
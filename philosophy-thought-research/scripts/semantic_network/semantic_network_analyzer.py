@@ -1,5 +1,6 @@
 import networkx as nx
 import matplotlib.pyplot as plt
+import numpy as np
 from collections import defaultdict
 import json
 
@@ -14,21 +15,35 @@ class SemanticNetworkAnalyzer:
         words = [word.strip('.,!?:;"()[]') for word in words]
         words = [word for word in words if word]
         
-        # 构建共现网络
-        for i, word in enumerate(words):
-            if word not in self.network.nodes:
-                self.network.add_node(word)
-            
-            # 窗口内的共现关系
-            for j in range(i+1, min(i+window_size+1, len(words))):
-                neighbor = words[j]
-                if neighbor not in self.network.nodes:
-                    self.network.add_node(neighbor)
-                
-                if self.network.has_edge(word, neighbor):
-                    self.network[word][neighbor]['weight'] += 1
-                else:
-                    self.network.add_edge(word, neighbor, weight=1)
+        # 按首次出现顺序给词语编号，把文本转换为整数id数组
+        vocabulary = list(dict.fromkeys(words))
+        word_ids = {word: i for i, word in enumerate(vocabulary)}
+        ids = np.fromiter((word_ids[word] for word in words), dtype=np.int64, count=len(words))
+        self.network.add_nodes_from(vocabulary)
+        
+        # 窗口内的共现关系：对每个偏移量d错位配对，再按原逐词扫描的先后顺序排列
+        shifts = range(1, min(window_size, len(words) - 1) + 1)
+        if not shifts:
+            return self.network
+        positions = np.concatenate([np.arange(len(words) - d) * window_size + (d - 1) for d in shifts])
+        scan_order = np.argsort(positions)
+        left = np.concatenate([ids[:-d] for d in shifts])[scan_order]
+        right = np.concatenate([ids[d:] for d in shifts])[scan_order]
+        
+        # 无向图中(a, b)与(b, a)是同一条边，按较小id在前编码后一次统计共现次数
+        pair_keys = np.minimum(left, right) * len(vocabulary) + np.maximum(left, right)
+        _, first_index, counts = np.unique(pair_keys, return_index=True, return_counts=True)
+        
+        # 按首次共现的顺序累加已有边的权重并批量添加新边
+        order = np.argsort(first_index)
+        new_edges = []
+        for i, count in zip(first_index[order].tolist(), counts[order].tolist()):
+            word, neighbor = vocabulary[left[i]], vocabulary[right[i]]
+            if self.network.has_edge(word, neighbor):
+                self.network[word][neighbor]['weight'] += count
+            else:
+                new_edges.append((word, neighbor, {'weight': count}))
+        self.network.add_edges_from(new_edges)
         
         return self.network
     
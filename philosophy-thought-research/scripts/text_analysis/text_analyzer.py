@@ -11,9 +11,10 @@ import re
 import nltk
 import networkx as nx
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
+from nltk.tokenize import sent_tokenize
 from nltk.stem import WordNetLemmatizer
 from collections import Counter, defaultdict
+from functools import cached_property, lru_cache
 
 # 初始化全局变量
 has_spacy = False
@@ -24,7 +25,42 @@ has_gensim = False
 corpora = None
 models = None
 
-# 延迟导入函数
+# 处理文本所需的NLTK资源：(下载包名, nltk.data中的资源路径)
+NLTK_RESOURCES = (
+    ('punkt', 'tokenizers/punkt'),
+    ('stopwords', 'corpora/stopwords'),
+    ('wordnet', 'corpora/wordnet'),
+    ('averaged_perceptron_tagger', 'taggers/averaged_perceptron_tagger'),
+)
+
+# 一次匹配出只由字母组成的词（含非ASCII字母），相当于分词后按isalpha过滤
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+# 共用的词形还原器，WordNet语料在首次还原时才加载
+LEMMATIZER = WordNetLemmatizer()
+
+@lru_cache(maxsize=None)
+def english_stopwords():
+    """
+    英文停用词集合，进程内只读取一次
+    """
+    return frozenset(stopwords.words('english'))
+
+@lru_cache(maxsize=None)
+def ensure_nltk_resource(package, path):
+    """
+    确保NLTK资源可用：本地已有时直接返回，找不到时才下载，每个资源在进程内只检查一次
+    """
+    try:
+        nltk.data.find(path)
+    except LookupError:
+        try:
+            nltk.download(package, quiet=True)
+        except Exception as e:
+            print(f"加载NLTK资源时出错: {e}")
+
+# 延迟导入函数，每个模块在进程内只尝试导入一次
+@lru_cache(maxsize=None)
 def import_spacy():
     """
     尝试导入spacy
@@ -39,6 +75,7 @@ def import_spacy():
         has_spacy = False
         spacy = None
 
+@lru_cache(maxsize=None)
 def import_textblob():
     """
     尝试导入textblob
@@ -53,6 +90,7 @@ def import_textblob():
         has_textblob = False
         TextBlob = None
 
+@lru_cache(maxsize=None)
 def import_gensim():
     """
     尝试导入gensim
@@ -88,32 +126,8 @@ class TextAnalyzer:
         self.tokens = []
         self.lemmatized_tokens = []
         self.named_entities = []
-        
-        # 加载NLTK资源
-        try:
-            nltk.download('punkt', quiet=True)
-            nltk.download('stopwords', quiet=True)
-            nltk.download('wordnet', quiet=True)
-            nltk.download('averaged_perceptron_tagger', quiet=True)
-        except Exception as e:
-            print(f"加载NLTK资源时出错: {e}")
-        
-        # 延迟导入可选模块
-        import_spacy()
-        import_textblob()
-        import_gensim()
-        
-        # 加载spaCy模型
-        self.nlp = None
-        if has_spacy:
-            try:
-                self.nlp = spacy.load('en_core_web_sm')
-            except Exception as e:
-                print(f"加载spaCy模型时出错: {e}")
-                print("spaCy功能将不可用，但其他功能仍然可以使用")
-                self.nlp = None
-        else:
-            print("spaCy未导入，相关功能将不可用")
+        # 命名实体是否已针对当前文本提取
+        self._entities_extracted = False
         
         # 加载文本
         if text_path:
@@ -122,6 +136,25 @@ class TextAnalyzer:
             self.text = text_content
             self.process_text()
     
+    @cached_property
+    def nlp(self):
+        """
+        首次访问时导入spaCy并加载模型
+        
+        Returns:
+            spacy.language.Language: spaCy模型，不可用时为None
+        """
+        import_spacy()
+        if not has_spacy:
+            print("spaCy未导入，相关功能将不可用")
+            return None
+        try:
+            return spacy.load('en_core_web_sm')
+        except Exception as e:
+            print(f"加载spaCy模型时出错: {e}")
+            print("spaCy功能将不可用，但其他功能仍然可以使用")
+            return None
+    
     def load_text_from_file(self, file_path):
         """
         从文件加载文本
@@ -137,31 +170,51 @@ class TextAnalyzer:
         except Exception as e:
             print(f"加载文本时出错: {e}")
     
-    def process_text(self):
+    def process_text(self, extract_entities=False):
         """
         处理文本，进行分词、词性标注等
+        
+        Args:
+            extract_entities (bool): 是否立即进行命名实体识别，默认在首次需要时才进行
         """
         if not self.text:
             return
         
+        # 首次处理文本时检查NLTK资源，缺失时才下载
+        for package, path in NLTK_RESOURCES:
+            ensure_nltk_resource(package, path)
+        
         # 分句
         self.sentences = sent_tokenize(self.text)
         
-        # 分词
-        self.tokens = word_tokenize(self.text)
+        # 分词：用正则一次取出字母词，同时去除了标点和数字，再去除停用词
+        stop_words = english_stopwords()
+        self.tokens = [token for token in WORD_PATTERN.findall(self.text) if token.lower() not in stop_words]
         
-        # 去除停用词和标点
-        stop_words = set(stopwords.words('english'))
-        self.tokens = [token for token in self.tokens if token.isalpha() and token.lower() not in stop_words]
+        # 词形还原：每个不同的词只还原一次
+        lowered_tokens = [token.lower() for token in self.tokens]
+        lemmas = {word: LEMMATIZER.lemmatize(word) for word in set(lowered_tokens)}
+        self.lemmatized_tokens = [lemmas[word] for word in lowered_tokens]
         
-        # 词形还原
-        lemmatizer = WordNetLemmatizer()
-        self.lemmatized_tokens = [lemmatizer.lemmatize(token.lower()) for token in self.tokens]
+        # 文本变化后需要重新识别命名实体
+        self.named_entities = []
+        self._entities_extracted = False
+        if extract_entities:
+            self.extract_named_entities()
+    
+    def extract_named_entities(self):
+        """
+        命名实体识别，结果针对当前文本缓存
         
-        # 命名实体识别
-        if self.nlp:
-            doc = self.nlp(self.text)
-            self.named_entities = [(ent.text, ent.label_) for ent in doc.ents]
+        Returns:
+            list: (实体文本, 实体类型)列表
+        """
+        if not self._entities_extracted and self.text:
+            if self.nlp:
+                doc = self.nlp(self.text)
+                self.named_entities = [(ent.text, ent.label_) for ent in doc.ents]
+            self._entities_extracted = True
+        return self.named_entities
     
     def analyze(self):
         """
@@ -181,7 +234,7 @@ class TextAnalyzer:
             "sentence_count": len(self.sentences),
             "token_count": len(self.tokens),
             "unique_tokens": len(set(self.lemmatized_tokens)),
-            "named_entities": self.named_entities[:10]  # 只返回前10个命名实体
+            "named_entities": self.extract_named_entities()[:10]  # 只返回前10个命名实体
         }
         
         return analysis
@@ -228,6 +281,7 @@ class TextAnalyzer:
         Returns:
             list: 主题列表
         """
+        import_gensim()
         if not has_gensim:
             print("Gensim未导入，主题提取功能不可用")
             return []
@@ -263,6 +317,7 @@ class TextAnalyzer:
         Returns:
             dict: 情感分析结果
         """
+        import_textblob()
         if not has_textblob:
             print("TextBlob未导入，情感分析功能不可用")
             return {"polarity": 0.0, "subjectivity": 0.0}
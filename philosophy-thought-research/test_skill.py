@@ -5,19 +5,32 @@
 哲学与思想研究技能测试脚本
 """
 
+import json
+import math
 import os
 import sys
+import tempfile
+import warnings
+
+import networkx as nx
+import nltk
+import numpy as np
+from nltk.corpus import stopwords
+from nltk.stem import WordNetLemmatizer
+from nltk.tokenize import word_tokenize
+from scipy import stats
 
 # 添加脚本目录到路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from scripts.text_analysis.text_analyzer import TextAnalyzer
+from scripts.argument_analysis import argument_analyzer as argument_module
 from scripts.argument_analysis.argument_analyzer import ArgumentAnalyzer
 from scripts.semantic_network.semantic_network_analyzer import SemanticNetworkAnalyzer
 from scripts.concept_visualization.concept_visualizer import ConceptVisualizer
 from scripts.time_series_analysis.time_series_analyzer import TimeSeriesAnalyzer
 from scripts.cross_cultural_analysis.cross_cultural_analyzer import CrossCulturalAnalyzer
-from scripts.influence_network_analysis.influence_network_analyzer import InfluenceNetworkAnalyzer
+from scripts.influence_network_analysis.influence_network_analyzer import InfluenceNetworkAnalyzer, _eigenvector_centrality, _merge_communities
 from scripts.concept_application_analysis.concept_application_analyzer import ConceptApplicationAnalyzer
 
 def test_text_analyzer():
@@ -46,6 +59,41 @@ def test_text_analyzer():
     print("文本分析模块测试: 跳过")
     return True
 
+def test_text_tokenization_matches_word_tokenize():
+    """
+    测试文本分析模块的正则分词与NLTK分词后按isalpha过滤的原始实现一致
+    """
+    print("\n=== 测试文本分词 ===")
+    
+    # 参照实现和process_text都需要本地的NLTK资源，缺失时跳过
+    for path in ('tokenizers/punkt', 'tokenizers/punkt_tab', 'corpora/stopwords', 'corpora/wordnet'):
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            print(f"缺少NLTK资源{path}，文本分词测试: 跳过")
+            return True
+    
+    # 缩写和连字符词的切分方式有意不同，不在对照范围内
+    fixtures = [
+        "",
+        "Philosophy",
+        "the",
+        "Philosophy is the study of general and fundamental questions.",
+        "What is knowledge? Is there a God? 42 questions, 3 answers!",
+        "Nietzsche wrote of the Übermensch; Descartes wrote cogito, ergo sum.",
+        "Being being BEING beings (being) [beings]"
+    ]
+    stop_words = set(stopwords.words('english'))
+    lemmatizer = WordNetLemmatizer()
+    for text in fixtures:
+        analyzer = TextAnalyzer(text_content=text)
+        expected = [token for token in word_tokenize(text) if token.isalpha() and token.lower() not in stop_words] if text else []
+        assert analyzer.tokens == expected, f"分词结果与原始实现不一致: {text!r}"
+        assert analyzer.lemmatized_tokens == [lemmatizer.lemmatize(token.lower()) for token in expected]
+    
+    print("文本分词测试成功!")
+    return True
+
 def test_argument_analyzer():
     """
     测试论证分析模块
@@ -170,6 +218,13 @@ def test_concept_visualizer():
         }
         visualizer.visualize_concept_hierarchy(hierarchy, output_path="test_concept_hierarchy.png")
         
+        # 叶子节点的子节点写作None时也应正常绘制
+        leaf_hierarchy = {"哲学": {"伦理学": None, "美学": {"艺术哲学": None}}}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            leaf_output = os.path.join(tmp_dir, "concept_hierarchy_none_leaves.png")
+            visualizer.visualize_concept_hierarchy(leaf_hierarchy, output_path=leaf_output)
+            assert os.path.exists(leaf_output), "None叶子节点的层次结构未能绘制"
+        
         # 示例2: 概念演变可视化
         concept_timeline = {
             "存在": {"古希腊": 5, "中世纪": 3, "近代": 4, "现代": 5},
@@ -244,6 +299,103 @@ def test_cross_cultural_analyzer():
         print(f"跨文化思想分析模块测试失败: {e}")
         return False
 
+def test_philosophical_similarities_match_pearsonr():
+    """
+    测试哲学相似性矩阵与逐对调用stats.pearsonr的原始实现一致
+    """
+    print("\n=== 测试哲学相似性矩阵 ===")
+    
+    fixtures = [
+        {"西方哲学": {"存在": 5, "知识": 3, "理性": 4}, "中国哲学": {"道": 5, "德": 4, "存在": 2}},
+        {"西方哲学": {"存在": 5, "知识": 3}, "中国哲学": {"存在": 1, "知识": 4}, "印度哲学": {"存在": 2, "轮回": 5}},
+        # 取值全部相同的行相关系数为nan
+        {"西方哲学": {"存在": 3, "知识": 3}, "中国哲学": {"存在": 1, "知识": 4}}
+    ]
+    analyzer = CrossCulturalAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for philosophy_data in fixtures:
+            similarity = analyzer.analyze_philosophical_similarities(philosophy_data, output_path=os.path.join(tmp_dir, "similarities.png"))
+            
+            philosophies = list(philosophy_data)
+            concepts = list(dict.fromkeys(concept for values in philosophy_data.values() for concept in values))
+            matrix = np.array([[philosophy_data[phil].get(concept, 0) for concept in concepts] for phil in philosophies], dtype=np.float64)
+            expected = np.full((len(philosophies), len(philosophies)), np.nan)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                for i in range(len(philosophies)):
+                    for j in range(len(philosophies)):
+                        expected[i, j] = stats.pearsonr(matrix[i], matrix[j])[0]
+            assert similarity.dtype == np.float64
+            assert np.allclose(similarity, expected, rtol=0, atol=1e-6, equal_nan=True), f"相似性矩阵与pearsonr不一致: {philosophy_data}"
+            # 对角线恰为1，取值全部相同的行为nan
+            assert np.array_equal(np.diag(similarity), np.where(np.isnan(np.diag(expected)), np.nan, 1.0), equal_nan=True), f"相似性矩阵对角线不为1: {philosophy_data}"
+    
+    print("哲学相似性矩阵测试成功!")
+    return True
+
+def test_conceptual_overlap_matches_set_operations():
+    """
+    测试概念重叠分析与逐对做集合运算的原始实现一致
+    """
+    print("\n=== 测试概念重叠分析 ===")
+    
+    fixtures = [
+        {"西方": {"存在": 5}},
+        {"西方": {"存在": 5, "知识": 3}, "中国": {"存在": 2, "道": 5}},
+        {"西方": {}, "中国": {"道": 5}, "印度": {}},
+        {"西方": {"存在": 1, "知识": 2}, "中国": {"知识": 2, "存在": 1}, "印度": {"轮回": 3, "存在": 4, "知识": 1}}
+    ]
+    analyzer = CrossCulturalAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for culture_data in fixtures:
+            overlap = analyzer.analyze_conceptual_overlap(culture_data, output_path=os.path.join(tmp_dir, "overlap.png"))
+            
+            cultures = list(culture_data)
+            expected_pairs = [(cultures[i], cultures[j]) for i in range(len(cultures)) for j in range(i + 1, len(cultures))]
+            assert list(overlap) == expected_pairs
+            for culture1, culture2 in expected_pairs:
+                concepts1, concepts2 = set(culture_data[culture1]), set(culture_data[culture2])
+                common = concepts1 & concepts2
+                smaller = min(len(concepts1), len(concepts2))
+                union = concepts1 | concepts2
+                result = overlap[(culture1, culture2)]
+                assert sorted(result['common_concepts']) == sorted(common)
+                assert result['overlap_ratio'] == (len(common) / smaller if smaller > 0 else 0)
+                assert result['jaccard_similarity'] == (len(common) / len(union) if union else 0)
+                assert (result['count_common'], result['count_culture1'], result['count_culture2']) == (len(common), len(concepts1), len(concepts2))
+    
+    print("概念重叠分析测试成功!")
+    return True
+
+def test_cultural_distance_map_matches_pairwise_norm():
+    """
+    测试文化距离矩阵与逐对计算欧氏距离的原始实现一致
+    """
+    print("\n=== 测试文化距离地图 ===")
+    
+    fixtures = [
+        {"西方": {"理性": 5}},
+        {"西方": {"理性": 5, "经验": 3}, "中国": {"理性": 2, "经验": 4}, "印度": {"理性": 1, "经验": 1}},
+        # 取值个数不同时只比较共同长度的前缀
+        {"西方": {"理性": 5, "经验": 3, "自由": 4}, "中国": {"和谐": 5}, "印度": {}}
+    ]
+    analyzer = CrossCulturalAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for culture_data in fixtures:
+            distance_matrix = analyzer.generate_cultural_distance_map(culture_data, output_path=os.path.join(tmp_dir, "distance.png"))
+            
+            value_lists = [list(values.values()) for values in culture_data.values()]
+            expected = np.zeros((len(value_lists), len(value_lists)))
+            for i, values1 in enumerate(value_lists):
+                for j, values2 in enumerate(value_lists):
+                    if i != j:
+                        min_len = min(len(values1), len(values2))
+                        expected[i, j] = np.linalg.norm(np.array(values1[:min_len]) - np.array(values2[:min_len]))
+            assert np.allclose(distance_matrix, expected), f"距离矩阵与原始实现不一致: {culture_data}"
+    
+    print("文化距离地图测试成功!")
+    return True
+
 def test_influence_network_analyzer():
     """
     测试影响网络分析模块
@@ -288,6 +440,378 @@ def test_influence_network_analyzer():
         traceback.print_exc()
         return False
 
+def _three_cluster_network():
+    """
+    构建三个5节点团依次用弱边相连的测试影响网络
+    """
+    analyzer = InfluenceNetworkAnalyzer()
+    relationships = []
+    for base in ("A", "B", "C"):
+        members = [f"{base}{i}" for i in range(5)]
+        relationships.extend((u, v, 1.0, "influence") for i, u in enumerate(members) for v in members[i+1:])
+    relationships.append(("A4", "B0", 0.5, "influence"))
+    relationships.append(("B4", "C0", 0.5, "influence"))
+    influencers = {node: {} for source, target, _, _ in relationships for node in (source, target)}
+    analyzer.build_influence_network(influencers, relationships)
+    return analyzer
+
+def test_influence_communities_cap():
+    """
+    测试影响社区分析的n_communities上限
+    """
+    print("\n=== 测试影响社区数量上限 ===")
+    
+    analyzer = _three_cluster_network()
+    
+    # 不指定上限时三个团各自成为一个社区
+    communities = analyzer.analyze_influence_communities()
+    assert len(communities) == 3, f"应识别出3个社区，实际为{len(communities)}个"
+    
+    # 指定上限后合并为2个社区，且不丢失任何节点
+    capped = analyzer.analyze_influence_communities(n_communities=2)
+    assert len(capped) == 2, f"n_communities=2时应返回2个社区，实际为{len(capped)}个"
+    members = sorted(member for community in capped.values() for member in community['members'])
+    assert members == sorted(analyzer.network.nodes), "合并社区后节点不完整"
+    assert sum(community['size'] for community in capped.values()) == analyzer.network.number_of_nodes()
+    
+    # 旧版networkx的合并回退应得到与cutoff/best_n相同的划分
+    undirected = analyzer.network.to_undirected()
+    full = nx.community.greedy_modularity_communities(undirected, weight='weight')
+    merged = _merge_communities(undirected, full, 2)
+    assert sorted(map(sorted, merged)) == sorted(sorted(community['members']) for community in capped.values())
+    
+    print("影响社区数量上限测试成功!")
+    return True
+
+def test_influence_network_properties_match_networkx():
+    """
+    测试网络属性的闭式密度和稀疏矩阵传递性与NetworkX的实现一致
+    """
+    print("\n=== 测试影响网络属性 ===")
+    
+    fixtures = [
+        nx.DiGraph([("A", "A")]),
+        nx.DiGraph([("A", "B"), ("B", "A")]),
+        nx.DiGraph([("A", "B"), ("B", "C"), ("C", "A"), ("A", "A"), ("C", "D")]),
+        nx.gnp_random_graph(60, 0.08, seed=3, directed=True)
+    ]
+    single_node = nx.DiGraph()
+    single_node.add_node("A")
+    fixtures.append(single_node)
+    
+    for graph in fixtures:
+        analyzer = InfluenceNetworkAnalyzer()
+        analyzer.network = graph
+        properties = analyzer.analyze_network_properties()
+        assert properties['density'] == nx.density(graph)
+        assert math.isclose(properties['transitivity'], nx.transitivity(graph.to_undirected()), abs_tol=1e-12), f"传递性与NetworkX不一致: {list(graph.edges)}"
+        assert math.isclose(properties['average_clustering'], nx.average_clustering(graph.to_undirected()), abs_tol=1e-12)
+    
+    print("影响网络属性测试成功!")
+    return True
+
+def test_eigenvector_centrality_matches_networkx():
+    """
+    测试稀疏幂迭代的特征向量中心性与nx.eigenvector_centrality一致
+    """
+    print("\n=== 测试特征向量中心性 ===")
+    
+    fixtures = [
+        nx.DiGraph([("A", "B"), ("B", "A")]),
+        nx.DiGraph([("A", "B"), ("B", "C"), ("C", "A"), ("A", "A"), ("C", "D")]),
+        nx.gnp_random_graph(80, 0.1, seed=5, directed=True)
+    ]
+    for graph in fixtures:
+        analyzer = InfluenceNetworkAnalyzer()
+        analyzer.network = graph
+        eigenvector = analyzer.identify_key_influencers()['centrality']['eigenvector_centrality']
+        expected = nx.eigenvector_centrality(graph, max_iter=1000)
+        assert eigenvector.keys() == expected.keys()
+        assert all(math.isclose(eigenvector[node], value, abs_tol=1e-9) for node, value in expected.items()), f"特征向量中心性与NetworkX不一致: {list(graph.edges)[:5]}"
+    
+    # 空网络不计算中心性
+    assert _eigenvector_centrality(nx.DiGraph()) == {}
+    
+    print("特征向量中心性测试成功!")
+    return True
+
+def test_key_influencer_ranking_matches_sorted_scores():
+    """
+    测试关键影响者的向量化加权排名与逐节点累加后排序的原始实现一致
+    """
+    print("\n=== 测试关键影响者排名 ===")
+    
+    fixtures = [
+        nx.DiGraph(),
+        # 星形网络中叶子节点同分，按原节点顺序排列
+        nx.DiGraph([("中心", leaf) for leaf in "ABCDE"]),
+        # 无环网络中特征向量中心性不收敛，该项为空字典
+        nx.DiGraph([("A", "B"), ("B", "C"), ("A", "C")]),
+        nx.gnp_random_graph(40, 0.1, seed=11, directed=True)
+    ]
+    for graph in fixtures:
+        analyzer = InfluenceNetworkAnalyzer()
+        analyzer.network = graph
+        for top_n in (-1, 0, 1, 3, 10, 100):
+            result = analyzer.identify_key_influencers(top_n=top_n)
+            centrality = result['centrality']
+            scores = {}
+            for node in graph.nodes:
+                score = 0
+                for name, weight in InfluenceNetworkAnalyzer.CENTRALITY_WEIGHTS:
+                    if node in centrality[name]:
+                        score += centrality[name][node] * weight
+                scores[node] = score
+            expected = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_n]
+            assert result['key_influencers'] == expected, f"排名与原始实现不一致: top_n={top_n}"
+    
+    print("关键影响者排名测试成功!")
+    return True
+
+def test_influence_paths_by_weight():
+    """
+    测试影响路径按权重乘积而不是跳数挑选
+    """
+    print("\n=== 测试影响路径选择 ===")
+    
+    analyzer = InfluenceNetworkAnalyzer()
+    relationships = [
+        ("A", "B", 0.1, "influence"),
+        ("A", "C", 0.9, "influence"),
+        ("C", "D", 0.9, "influence"),
+        ("D", "B", 0.9, "influence")
+    ]
+    analyzer.build_influence_network({node: {} for node in "ABCD"}, relationships)
+    
+    paths = analyzer.analyze_influence_paths("A", "B", max_paths=1)
+    assert [path for path, _ in paths] == [["A", "C", "D", "B"]], f"应返回权重最大的路径，实际为{paths}"
+    assert math.isclose(paths[0][1], 0.9 ** 3)
+    
+    # 按跳数挑选时只会得到直接相连的低权重路径
+    fewest_hops = sorted(nx.all_simple_paths(analyzer.network, "A", "B"), key=len)[:1]
+    assert fewest_hops == [["A", "B"]]
+    
+    # max_paths足够大时两种方式得到相同的路径集合，并按权重从大到小排列
+    all_paths = analyzer.analyze_influence_paths("A", "B", max_paths=5)
+    assert [path for path, _ in all_paths] == [["A", "C", "D", "B"], ["A", "B"]]
+    
+    print("影响路径选择测试成功!")
+    return True
+
+def test_influence_betweenness_exact_by_default():
+    """
+    测试关键影响者识别默认精确计算介数中心性，只有指定betweenness_k时才抽样
+    """
+    print("\n=== 测试介数中心性计算方式 ===")
+    
+    analyzer = InfluenceNetworkAnalyzer()
+    analyzer.network = nx.gnp_random_graph(250, 0.02, seed=7, directed=True)
+    
+    exact = nx.betweenness_centrality(analyzer.network)
+    result = analyzer.identify_key_influencers()
+    betweenness = result['centrality']['betweenness_centrality']
+    assert all(math.isclose(betweenness[node], value, abs_tol=1e-9) for node, value in exact.items()), "默认应精确计算介数中心性"
+    
+    sampled = analyzer.identify_key_influencers(betweenness_k=20)['centrality']['betweenness_centrality']
+    assert set(sampled) == set(exact)
+    assert any(not math.isclose(sampled[node], value, abs_tol=1e-9) for node, value in exact.items()), "指定betweenness_k时应抽样近似计算"
+    
+    print("介数中心性计算方式测试成功!")
+    return True
+
+def test_influence_network_json_import():
+    """
+    测试导入标准库json导出的含NaN权重的网络文件
+    """
+    print("\n=== 测试影响网络JSON导入 ===")
+    
+    network_data = {
+        'nodes': [{'id': "柏拉图", 'era': "古希腊"}, {'id': "亚里士多德", 'era': "古希腊"}],
+        'edges': [{'source': "柏拉图", 'target': "亚里士多德", 'weight': float('nan'), 'relation': "teacher"}]
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, "network.json")
+        with open(input_path, 'w', encoding='utf-8') as f:
+            json.dump(network_data, f, ensure_ascii=False, indent=2)
+        
+        analyzer = InfluenceNetworkAnalyzer()
+        analyzer.import_network(input_path, format='json')
+    
+    assert analyzer.network.number_of_nodes() == 2, "含NaN的JSON文件未能导入"
+    assert analyzer.network.nodes["柏拉图"]['era'] == "古希腊"
+    assert math.isnan(analyzer.network["柏拉图"]["亚里士多德"]['weight'])
+    
+    print("影响网络JSON导入测试成功!")
+    return True
+
+def _pairwise_influence_edges(text_data, threshold=0.3):
+    """
+    按逐对比较词集合的原始实现计算影响边，作为稀疏矩阵实现的参照
+    """
+    philosophers = list(text_data.keys())
+    edges = []
+    for i, phil1 in enumerate(philosophers):
+        for j, phil2 in enumerate(philosophers):
+            if i != j:
+                words1 = set(text_data[phil1].lower().split())
+                words2 = set(text_data[phil2].lower().split())
+                common_words = words1.intersection(words2)
+                similarity = len(common_words) / min(len(words1), len(words2)) if min(len(words1), len(words2)) > 0 else 0
+                if similarity > threshold:
+                    edges.append((phil1, phil2, {'weight': similarity, 'relation': "influence"}))
+    return philosophers, edges
+
+def test_influence_network_from_text_matches_pairwise():
+    """
+    测试从文本构建影响网络的结果与逐对比较的原始实现一致
+    """
+    print("\n=== 测试从文本构建影响网络 ===")
+    
+    fixtures = [
+        {},
+        {"柏拉图": ""},
+        {"柏拉图": "idea"},
+        {"柏拉图": "idea", "亚里士多德": ""},
+        {"柏拉图": "", "亚里士多德": ""},
+        {"柏拉图": "Idea form good", "亚里士多德": "idea FORM substance", "笛卡尔": "cogito ergo sum"},
+        {"柏拉图": "the good the good", "亚里士多德": "good the", "康德": "duty reason the", "休谟": "impression idea"}
+    ]
+    for text_data in fixtures:
+        for threshold in (0.0, 0.3, 0.5, 1.0):
+            analyzer = InfluenceNetworkAnalyzer()
+            analyzer.build_network_from_text(text_data, threshold=threshold)
+            nodes, edges = _pairwise_influence_edges(text_data, threshold)
+            assert list(analyzer.network.nodes) == nodes
+            assert list(analyzer.network.edges(data=True)) == edges, f"影响边与原始实现不一致: {text_data}, threshold={threshold}"
+    
+    print("从文本构建影响网络测试成功!")
+    return True
+
+def _scan_semantic_network(text, window_size=2, network=None):
+    """
+    按逐词扫描窗口的原始实现构建语义网络，作为错位配对实现的参照
+    """
+    network = nx.Graph() if network is None else network
+    words = [word.strip('.,!?:;"()[]') for word in text.lower().split()]
+    words = [word for word in words if word]
+    for i, word in enumerate(words):
+        if word not in network.nodes:
+            network.add_node(word)
+        for j in range(i+1, min(i+window_size+1, len(words))):
+            neighbor = words[j]
+            if neighbor not in network.nodes:
+                network.add_node(neighbor)
+            if network.has_edge(word, neighbor):
+                network[word][neighbor]['weight'] += 1
+            else:
+                network.add_edge(word, neighbor, weight=1)
+    return network
+
+def test_semantic_network_window_matches_scan():
+    """
+    测试语义网络的窗口共现结果与逐词扫描的原始实现一致
+    """
+    print("\n=== 测试语义网络窗口共现 ===")
+    
+    fixtures = [
+        "",
+        "   ",
+        "(.) !",
+        "philosophy",
+        "Philosophy.",
+        "being being",
+        "being being being being",
+        "being nothing being nothing being",
+        "Being is; being is not. Nothing (is) being!",
+        "the study of knowledge, the study of being, and the study of value"
+    ]
+    for text in fixtures:
+        for window_size in (0, 1, 2, 3, 10):
+            analyzer = SemanticNetworkAnalyzer()
+            analyzer.build_network_from_text(text, window_size=window_size)
+            expected = _scan_semantic_network(text, window_size)
+            assert list(analyzer.network.nodes) == list(expected.nodes)
+            assert list(analyzer.network.edges(data=True)) == list(expected.edges(data=True)), f"共现边与原始实现不一致: {text!r}, window_size={window_size}"
+    
+    # 同一网络上多次构建时累加已有边的权重
+    analyzer = SemanticNetworkAnalyzer()
+    expected = nx.Graph()
+    for text in ("being and nothing", "nothing and being and being"):
+        analyzer.build_network_from_text(text)
+        _scan_semantic_network(text, network=expected)
+    assert list(analyzer.network.nodes) == list(expected.nodes)
+    assert list(analyzer.network.edges(data=True)) == list(expected.edges(data=True))
+    
+    print("语义网络窗口共现测试成功!")
+    return True
+
+def _sequential_arguments(sentences):
+    """
+    按逐句维护当前论证的原始实现提取论证，作为批量切分实现的参照
+    """
+    arguments = []
+    current = {'premises': [], 'conclusion': None, 'inference_type': 'deductive', 'sentence_indices': []}
+    for i, sentence in enumerate(sentences):
+        sentence_lower = sentence.lower()
+        if argument_module.PREMISE_RE.search(sentence_lower):
+            current['premises'].append(sentence)
+            current['sentence_indices'].append(i)
+        elif argument_module.CONCLUSION_RE.search(sentence_lower):
+            current['conclusion'] = sentence
+            current['sentence_indices'].append(i)
+            if current['premises'] and current['conclusion']:
+                arguments.append(current.copy())
+                current = {'premises': [], 'conclusion': None, 'inference_type': 'deductive', 'sentence_indices': []}
+        else:
+            current['premises'].append(sentence)
+            current['sentence_indices'].append(i)
+    if current['premises']:
+        if not current['conclusion'] and len(current['premises']) > 1:
+            current['conclusion'] = current['premises'][-1]
+            current['premises'] = current['premises'][:-1]
+        if current['conclusion']:
+            arguments.append(current)
+    return arguments
+
+def test_argument_markers_match_regex_fallback():
+    """
+    测试论证提取：自动机与未安装pyahocorasick时的正则回退结果一致，且与逐句提取的原始实现一致
+    """
+    print("\n=== 测试论证标记词匹配 ===")
+    
+    fixtures = [
+        [],
+        ["Therefore."],
+        ["Socrates is wise."],
+        ["Socrates is wise.", "Plato is wise."],
+        ["Thus it rains.", "Hence the ground is wet."],
+        ["All men are mortal.", "Socrates is a man.", "Therefore, Socrates is mortal."],
+        ["Therefore the premise comes late.", "Because it is raining.", "The ground is wet."],
+        ["Finally, we stop.", "So it ends."],
+        ["He was asleep.", "Thusly spoken.", "Sofa and ergonomics."],
+        ["Since light is finite, we see the past.", "Thus the universe has a history.", "So what?", "Ergo.", "It follows that nothing follows."],
+        ["Therefore_x is not a marker.", "x-therefore is one.", "THEREFORE, shouting counts."]
+    ]
+    analyzer = ArgumentAnalyzer()
+    automaton = argument_module._ARGUMENT_MARKER_AC
+    try:
+        for sentences in fixtures:
+            analyzer.sentences = list(sentences)
+            analyzer.sentences_lower = [sentence.lower() for sentence in sentences]
+            
+            argument_module._ARGUMENT_MARKER_AC = automaton
+            with_automaton = analyzer.extract_arguments()
+            argument_module._ARGUMENT_MARKER_AC = None
+            with_regex = analyzer.extract_arguments()
+            
+            assert with_automaton == with_regex, f"自动机与正则回退的论证不一致: {sentences}"
+            assert with_regex == _sequential_arguments(sentences), f"论证与逐句提取的结果不一致: {sentences}"
+    finally:
+        argument_module._ARGUMENT_MARKER_AC = automaton
+    
+    print("论证标记词匹配测试成功!")
+    return True
+
 def test_concept_application_analyzer():
     """
     测试概念应用分析模块
@@ -340,6 +864,70 @@ def test_concept_application_analyzer():
         print(f"概念应用分析模块测试失败: {e}")
         return False
 
+def test_application_trends_match_linregress():
+    """
+    测试批量线性回归的趋势分析与逐行调用stats.linregress一致
+    """
+    print("\n=== 测试概念应用趋势回归 ===")
+    
+    fixtures = [
+        # 只有两个时间点时linregress按特殊情况处理
+        {"自由": {"1900": 3, "2000": 5}, "正义": {"1900": 4, "2000": 4}},
+        {"自由": {"1900": 3, "1950": 4, "2000": 5}, "正义": {"1900": 4, "1950": 4, "2000": 4}, "平等": {"1950": 2}},
+        # 含小数的取值不会以int8存储
+        {"自由": {"1900": 0.5, "1950": 4.25, "2000": 1, "2050": 7}, "正义": {"1900": 2, "1950": 1, "2000": 2, "2050": 1}}
+    ]
+    analyzer = ConceptApplicationAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for trend_data in fixtures:
+            trends = analyzer.analyze_application_trends(trend_data, output_path=os.path.join(tmp_dir, "trends.png"))
+            
+            periods = sorted({period for values in trend_data.values() for period in values})
+            x = np.arange(len(periods))
+            for concept, values in trend_data.items():
+                y = np.array([values.get(period, 0) for period in periods], dtype=np.float64)
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    expected = stats.linregress(x, y)
+                result = trends[concept]
+                for key, value in (('slope', expected.slope), ('r_value', expected.rvalue), ('p_value', expected.pvalue), ('std_err', expected.stderr)):
+                    assert np.isclose(result[key], value, equal_nan=True), f"{concept}的{key}与linregress不一致: {result[key]} != {value}"
+                assert result['trend_direction'] == ('increasing' if expected.slope > 0 else 'decreasing' if expected.slope < 0 else 'stable')
+    
+    print("概念应用趋势回归测试成功!")
+    return True
+
+def test_application_similarities_match_pearsonr():
+    """
+    测试概念应用相似度矩阵与逐对调用stats.pearsonr的原始实现一致
+    """
+    print("\n=== 测试概念应用相似度 ===")
+    
+    fixtures = [
+        {"自由": {"政治": 5, "伦理": 4, "教育": 3}, "正义": {"政治": 5, "伦理": 5, "法律": 5}},
+        {"自由": {"政治": 5, "伦理": 1}, "正义": {"政治": 1, "伦理": 5}, "平等": {"政治": 3, "教育": 2}},
+        {"自由": {"政治": 0.5, "伦理": 2.5, "教育": 1}, "正义": {"政治": 2, "伦理": 1, "教育": 4}}
+    ]
+    analyzer = ConceptApplicationAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for application_data in fixtures:
+            similarity = analyzer.analyze_application_similarities(application_data, output_path=os.path.join(tmp_dir, "similarities.png"))
+            
+            concepts = list(application_data)
+            domains = list(dict.fromkeys(domain for values in application_data.values() for domain in values))
+            matrix = np.array([[application_data[concept].get(domain, 0) for domain in domains] for concept in concepts], dtype=np.float64)
+            expected = np.eye(len(concepts))
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                for i in range(len(concepts)):
+                    for j in range(len(concepts)):
+                        if i != j:
+                            expected[i, j] = stats.pearsonr(matrix[i], matrix[j])[0]
+            assert np.allclose(similarity, expected, equal_nan=True), f"相似度矩阵与pearsonr不一致: {application_data}"
+    
+    print("概念应用相似度测试成功!")
+    return True
+
 def main():
     """
     主测试函数